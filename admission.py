@@ -0,0 +1,98 @@
+"""
+Backlog-aware admission control for the AI Employee cycle
+Picks a processing mode from the Needs_Action backlog and how long the
+last cycle took, with hysteresis so the mode does not flap:
+- normal     every email gets a full plan; deferred mail is caught up
+- degraded   low-priority mail is deferred (note only, no plan) and
+             plans are summary-only
+- overloaded as degraded, and medium-priority mail is deferred too
+Every cycle is also capped at cycle_budget seconds; whatever is left
+over is picked up by the next cycle.
+"""
+
+import time
+
+from logging_setup import get_logger
+
+NORMAL = "normal"
+DEGRADED = "degraded"
+OVERLOADED = "overloaded"
+
+DEFAULT_HIGH_WATER = 50
+DEFAULT_LOW_WATER = 10
+DEFAULT_CYCLE_BUDGET_SECONDS = 10 * 60
+
+LOW_PRIORITY_SENDERS = ('noreply', 'no-reply', 'donotreply', 'newsletter', 'notifications', 'mailer-daemon')
+HIGH_PRIORITY_WORDS = ('urgent', 'asap', 'immediately', 'action required', 'deadline')
+
+logger = get_logger("admission")
+
+
+def classify_priority(email):
+    """Cheap header-only priority guess: high, medium or low"""
+    subject = (email.subject or "").lower()
+    sender = (email.sender or "").lower()
+
+    if any(word in subject for word in HIGH_PRIORITY_WORDS):
+        return "high"
+    if any(marker in sender for marker in LOW_PRIORITY_SENDERS):
+        return "low"
+
+    # Mailing lists and bulk mail announce themselves in the headers
+    for name, value in email.headers:
+        if name == 'list-unsubscribe' or (name == 'precedence' and
+                                          value.lower() in ('bulk', 'list', 'junk')):
+            return "low"
+
+    return "medium"
+
+
+class AdmissionController:
+    def __init__(self, high_water=DEFAULT_HIGH_WATER, low_water=DEFAULT_LOW_WATER,
+                 cycle_budget=DEFAULT_CYCLE_BUDGET_SECONDS):
+        self.high_water = high_water
+        self.low_water = low_water
+        self.cycle_budget = cycle_budget
+        self.mode = NORMAL
+        self.deadline = None
+
+    def start_cycle(self):
+        """Begin the time budget for a cycle"""
+        self.deadline = time.monotonic() + self.cycle_budget
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_defer(self, priority):
+        """Whether an email of this priority waits for a quieter cycle"""
+        if self.mode == OVERLOADED:
+            return priority != "high"
+        if self.mode == DEGRADED:
+            return priority == "low"
+        return False
+
+    @property
+    def summary_only(self):
+        return self.mode != NORMAL
+
+    def update(self, backlog, cycle_seconds):
+        """Choose the mode for the next cycle from this cycle's load"""
+        slow = cycle_seconds >= self.cycle_budget * 0.8
+        calm = cycle_seconds < self.cycle_budget * 0.5
+
+        if backlog >= self.high_water * 2 or (slow and backlog >= self.high_water):
+            mode = OVERLOADED
+        elif backlog >= self.high_water or slow:
+            mode = DEGRADED
+        elif backlog <= self.low_water and calm:
+            # Only step back to normal once the backlog has really drained
+            mode = NORMAL
+        else:
+            mode = self.mode
+
+        if mode != self.mode:
+            logger.warning("Admission mode changed",
+                           extra={'from': self.mode, 'to': mode, 'backlog': backlog,
+                                  'cycle_seconds': round(cycle_seconds, 1)})
+            self.mode = mode
+        return mode
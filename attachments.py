@@ -0,0 +1,173 @@
+"""
+Attachment capture into a content-addressed blob store
+Attachment parts are fetched through the email source (for Gmail, the
+attachments endpoint), decoded and hashed chunk by chunk straight into a temp file, and stored
+once per unique content under bronze_vault/Attachments/<sha[:2]>/<sha><ext>.
+The same PDF or logo arriving in a hundred emails is kept once on disk,
+but still downloaded a hundred times: Gmail exposes no content hash, so
+the bytes have to be fetched before a repeat can be recognized.
+
+Attachments/index.jsonl remembers which (message, part) already maps to
+which blob, so only re-processing the same message skips the fetch.
+"""
+
+import os
+import json
+import uuid
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from logging_setup import get_logger
+
+ATTACHMENTS_DIR_NAME = "Attachments"
+INDEX_FILE = "index.jsonl"
+
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024  # Gmail's own per-message limit
+MAX_WORKERS = 4
+# Base64 characters decoded per step; a multiple of 4 keeps chunks aligned
+CHUNK_CHARS = 64 * 1024
+
+logger = get_logger("attachments")
+
+
+def iter_attachment_parts(payload):
+    """Yield every payload part that carries a named attachment"""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        if part.get('filename') and part.get('body'):
+            yield part
+        stack.extend(reversed(part.get('parts', [])))
+
+
+class AttachmentStore:
+    def __init__(self, vault_path, source=None, max_bytes=MAX_ATTACHMENT_BYTES,
+                 max_workers=MAX_WORKERS):
+        self.store_path = os.path.join(vault_path, ATTACHMENTS_DIR_NAME)
+        self.index_file = os.path.join(self.store_path, INDEX_FILE)
+        self.source = source
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+
+        self.index = None
+        self.lock = threading.Lock()
+
+    def load_index(self):
+        """Map of 'message_id/part_id' -> stored attachment record"""
+        if self.index is None:
+            self.index = {}
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        record = json.loads(line)
+                        self.index[record['key']] = record
+        return self.index
+
+    def blob_path(self, digest, filename):
+        ext = os.path.splitext(filename)[1].lower()
+        return os.path.join(self.store_path, digest[:2], digest + ext)
+
+    def capture(self, email):
+        """Store all attachments of an email; returns records for linking"""
+        parts = email.attachments
+        if not parts:
+            return []
+
+        os.makedirs(self.store_path, exist_ok=True)
+        index = self.load_index()
+
+        results = [None] * len(parts)
+        pending = []
+        for i, part in enumerate(parts):
+            key = f"{email.id}/{part.get('partId', i)}"
+            size = part['body'].get('size', 0)
+            if key in index:
+                # Already stored on an earlier run, nothing to fetch
+                results[i] = index[key]
+            elif size > self.max_bytes:
+                logger.warning("Skipping attachment over size limit",
+                               extra={'file': part['filename'], 'size': size})
+                results[i] = {'key': key, 'filename': part['filename'], 'size': size,
+                              'skipped': "too large"}
+            else:
+                pending.append((i, key, part))
+
+        if len(pending) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [(i, pool.submit(self.store_part, email.id, key, part))
+                           for i, key, part in pending]
+                for i, future in futures:
+                    results[i] = future.result()
+        else:
+            for i, key, part in pending:
+                results[i] = self.store_part(email.id, key, part)
+
+        return [r for r in results if r]
+
+    def store_part(self, message_id, key, part):
+        """Fetch one attachment part and store it as a blob"""
+        filename = part['filename']
+        try:
+            data = part['body'].get('data')
+            if data is None:
+                data = self.source.fetch_attachment(message_id, part['body']['attachmentId'])
+        except self.source.errors as error:
+            logger.warning("Skipping attachment", extra={'file': filename, 'error': str(error)})
+            return {'key': key, 'filename': filename, 'skipped': "fetch failed"}
+
+        digest, size, tmp_path = self.write_chunks(data)
+        if size > self.max_bytes:
+            os.remove(tmp_path)
+            return {'key': key, 'filename': filename, 'size': size, 'skipped': "too large"}
+
+        path = self.blob_path(digest, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)  # Same content already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        record = {
+            'key': key,
+            'filename': filename,
+            'mime_type': part.get('mimeType'),
+            'size': size,
+            'sha256': digest,
+            'blob': os.path.relpath(path, os.path.dirname(self.store_path)).replace(os.sep, '/'),
+        }
+        with self.lock:
+            self.index[key] = record
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+    def write_chunks(self, data):
+        """Decode base64url data in chunks into a temp file; returns (sha256, size, path)"""
+        tmp_path = os.path.join(self.store_path, f".{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+
+        with open(tmp_path, 'wb') as f:
+            for start in range(0, len(data), CHUNK_CHARS):
+                piece = data[start:start + CHUNK_CHARS]
+                if start + CHUNK_CHARS >= len(data):
+                    piece += "=" * (-len(piece) % 4)  # Gmail may drop padding
+                chunk = base64.urlsafe_b64decode(piece)
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+
+        return digest.hexdigest(), size, tmp_path
+
+
+def attachment_links(records):
+    """Markdown lines linking a note (in Needs_Action or Done) to its blobs"""
+    lines = []
+    for record in records:
+        if record.get('skipped'):
+            lines.append(f"- {record['filename']} (not stored: {record['skipped']})")
+        else:
+            lines.append(f"- [{record['filename']}](../{record['blob']}) ({record['size']} bytes)")
+    return lines
@@ -0,0 +1,103 @@
+"""
+Memory benchmark: plain email dicts vs slotted Email records
+Builds synthetic Gmail responses and measures, with tracemalloc, how much
+memory each representation keeps alive once the raw responses are
+released, as happens after fetch_email returns. The pipeline reads every
+body it fingerprints, so the "body read" row is the one that matters for
+processed mail.
+
+Usage: python benchmark_email_record.py [message_count] [body_bytes]
+"""
+
+import sys
+import base64
+import tracemalloc
+from datetime import datetime
+
+from email_record import Email, decode_body
+
+
+def make_messages(count, body_bytes):
+    """Synthetic users.messages.get responses with a multipart payload"""
+    messages = []
+    for i in range(count):
+        text = (f"Message {i} " + "lorem ipsum dolor sit amet " * (body_bytes // 27 + 1))[:body_bytes]
+        data = base64.urlsafe_b64encode(text.encode('utf-8')).decode('ASCII')
+        messages.append({
+            'id': f"msg{i:08d}",
+            'payload': {
+                'mimeType': 'multipart/alternative',
+                'headers': [
+                    {'name': 'Subject', 'value': f"Subject {i}"},
+                    {'name': 'From', 'value': 'sender@example.com'},
+                ],
+                'parts': [{'mimeType': 'text/plain', 'body': {'data': data}}],
+            },
+        })
+    return messages
+
+
+def as_dicts(messages, timestamp):
+    """The old representation: one dict per email with the decoded body"""
+    emails = []
+    for message in messages:
+        headers = {h['name']: h['value'] for h in message['payload']['headers']}
+        emails.append({
+            'id': message['id'],
+            'subject': headers.get('Subject', ''),
+            'sender': headers.get('From', ''),
+            'body': decode_body(message['payload']),
+            'timestamp': timestamp,
+        })
+    return emails
+
+
+def as_records(messages, timestamp, read_body=False):
+    """The new representation: slotted records, body left encoded unless read"""
+    records = [Email.from_gmail(message, timestamp) for message in messages]
+    if read_body:
+        for record in records:
+            record.body
+    return records
+
+
+def measure(build):
+    """Bytes allocated by build() and still alive after it returns"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return result, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    body_bytes = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    timestamp = datetime.now().isoformat()
+
+    # The responses are built inside each measurement and dropped by the
+    # time it ends, so only what the representation retains is counted
+    _, dict_size = measure(lambda: as_dicts(make_messages(count, body_bytes), timestamp))
+    _, record_size = measure(lambda: as_records(make_messages(count, body_bytes), timestamp))
+    _, read_size = measure(lambda: as_records(make_messages(count, body_bytes), timestamp,
+                                              read_body=True))
+
+    print(f"{count} messages, {body_bytes} byte bodies")
+    print(f"{'Representation':<32} {'Total (KB)':>12} {'Per message (B)':>16}")
+    rows = [
+        ("dict with decoded body", dict_size),
+        ("Email record, body untouched", record_size),
+        ("Email record, body read", read_size),
+    ]
+    for label, size in rows:
+        print(f"{label:<32} {size / 1024:>12.1f} {size / count:>16.1f}")
+
+    change = read_size / dict_size - 1 if dict_size else 0.0
+    print(f"Records with the body read use {abs(change):.0%} "
+          f"{'less' if change <= 0 else 'more'} memory than dicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Record-and-replay cassettes for Gmail API traffic
+A cassette is a gzip-compressed JSON lines file holding the final
+outcome of every Gmail call a run made (messages.list, messages.get,
+messages.attachments.get, history.list, ...), keyed by method and
+parameters, together with how long the call took including rate
+limiter waits and retries.
+
+RecordingSource runs against the real mailbox and writes a cassette.
+Responses are scrubbed first: addresses, subjects, bodies and file names
+are replaced with keyed pseudonyms of the same shape, other headers are
+blanked and attachment bytes are replaced with pseudo-random bytes of
+the same size. Equal inputs map to equal outputs, so priorities,
+near-duplicates and attachment dedup behave as they did live (only a
+near-duplicate right at the distance threshold may fall the other way,
+since renamed words hash differently). The key is random per recording
+and never stored.
+
+ReplaySource feeds a cassette back to the pipeline without network or
+quota, either at full speed or sleeping for each call's recorded time.
+That way every build can be measured on the same real-world workload.
+
+Usage: python ai_employee.py --record cassettes/inbox.jsonl.gz
+       python ai_employee.py --replay cassettes/inbox.jsonl.gz [--recorded-timing]
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime
+
+from googleapiclient.errors import HttpError
+from gmail_source import GmailSource
+from admission import HIGH_PRIORITY_WORDS, LOW_PRIORITY_SENDERS
+from logging_setup import get_logger
+
+CASSETTE_VERSION = 1
+
+# Headers kept as recorded; address headers and Subject are pseudonymized,
+# every other header keeps its name but loses its value
+KEEP_HEADERS = {'content-type', 'content-transfer-encoding', 'mime-version', 'date', 'precedence'}
+TEXT_HEADERS = {'from', 'to', 'cc', 'bcc', 'reply-to', 'sender', 'delivered-to',
+                'return-path', 'subject'}
+SCRUBBED = "[scrubbed]"
+
+# Words that drive priority classification survive scrubbing
+KEEP_WORDS = {word for phrase in HIGH_PRIORITY_WORDS for word in phrase.split()}
+
+_ADDRESS = re.compile(r'([\w.+-]+)@([\w-]+(?:\.[\w-]+)*)')
+_WORD = re.compile(r'\w+')
+_HEX = re.compile(r'(?=.*\d)[0-9a-fA-F]+')
+_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+_HEX_DIGITS = "0123456789abcdef"
+
+logger = get_logger("cassette")
+
+
+def request_key(method, params):
+    """Lookup key for a call; parameters left at None are not sent, so not keyed"""
+    return method + " " + json.dumps({k: v for k, v in params.items() if v is not None},
+                                     sort_keys=True)
+
+
+class Scrubber:
+    """Keyed, shape-preserving pseudonymization of Gmail responses"""
+
+    def __init__(self, key=None):
+        self.key = key or os.urandom(16)
+        self.words = {}
+
+    def digest(self, value, size=8):
+        return hashlib.blake2b(value.encode('utf-8'), key=self.key, digest_size=size).digest()
+
+    def word(self, word):
+        """Stand-in for a word, number or ID with the same shape, cached per recording"""
+        if word.lower() in KEEP_WORDS:
+            return word
+        fake = self.words.get(word)
+        if fake is None:
+            raw = hashlib.shake_256(self.key + word.encode('utf-8')).digest(len(word))
+            # Hex IDs stay hex and digits stay digits, so numbers, dates and
+            # IDs are still recognized as such by the duplicate detector
+            is_hex = _HEX.fullmatch(word) is not None
+            chars = []
+            for c, b in zip(word, raw):
+                if c.isdigit():
+                    chars.append(str(b % 10))
+                elif is_hex:
+                    chars.append(_HEX_DIGITS[10 + b % 6])
+                else:
+                    chars.append(_LETTERS[b % 26])
+                if c.isupper():
+                    chars[-1] = chars[-1].upper()
+            fake = "".join(chars)
+            self.words[word] = fake
+        return fake
+
+    def address(self, match):
+        local, domain = match.group(1), match.group(2)
+        # Role addresses keep their marker so priority classification is unchanged
+        marker = next((m for m in LOW_PRIORITY_SENDERS if m in local.lower()), None)
+        fake_local = self.digest(local.lower()).hex()[:10]
+        if marker:
+            fake_local = f"{marker}-{fake_local}"
+        return f"{fake_local}@{self.digest(domain.lower()).hex()[:8]}.example"
+
+    def text(self, value):
+        value = _ADDRESS.sub(self.address, value)
+        # Pseudonymized addresses only contain hex and "example", leave them be
+        parts = re.split(r'(\S+@\S+\.example)', value)
+        return "".join(part if i % 2 else _WORD.sub(lambda m: self.word(m.group()), part)
+                       for i, part in enumerate(parts))
+
+    def data(self, data, is_text):
+        """Scrub base64url body or attachment data"""
+        raw = base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+        if is_text:
+            scrubbed = self.text(raw.decode('utf-8', errors='replace')).encode('utf-8')
+        else:
+            # Same content gives the same bytes, so blob dedup still sees repeats
+            seed = self.key + hashlib.sha256(raw).digest()
+            scrubbed = hashlib.shake_256(seed).digest(len(raw))
+        return base64.urlsafe_b64encode(scrubbed).decode('ASCII')
+
+    def filename(self, name):
+        stem, ext = os.path.splitext(name)
+        return self.text(stem) + ext
+
+    def payload(self, part):
+        for header in part.get('headers', []):
+            name = header['name'].lower()
+            if name in TEXT_HEADERS:
+                header['value'] = self.text(header['value'])
+            elif name not in KEEP_HEADERS:
+                header['value'] = SCRUBBED
+        if part.get('filename'):
+            part['filename'] = self.filename(part['filename'])
+        body = part.get('body', {})
+        if body.get('data'):
+            is_text = part.get('mimeType', '').startswith('text/') and not part.get('filename')
+            body['data'] = self.data(body['data'], is_text)
+        for child in part.get('parts', []):
+            self.payload(child)
+
+    def response(self, method, response):
+        """Scrubbed deep copy of an API response"""
+        response = json.loads(json.dumps(response))
+        if method == 'messages.attachments.get':
+            if response.get('data'):
+                response['data'] = self.data(response['data'], False)
+            return response
+
+        # Messages can appear in get responses and inside history records
+        stack = [response]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, dict):
+                if isinstance(item.get('payload'), dict):
+                    self.payload(item['payload'])
+                if isinstance(item.get('snippet'), str):
+                    item['snippet'] = self.text(item['snippet'])
+                stack.extend(v for k, v in item.items() if k != 'payload')
+            elif isinstance(item, list):
+                stack.extend(item)
+        return response
+
+
+class RecordingSource(GmailSource):
+    """GmailSource that writes every call's scrubbed outcome to a cassette"""
+
+    name = "gmail_recording"
+
+    def __init__(self, cassette_path, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette_path = cassette_path
+        self.scrubber = Scrubber()
+        self.write_lock = threading.Lock()
+        self.file = None
+
+    def connect(self):
+        if not super().connect():
+            return False
+        if os.path.dirname(self.cassette_path):
+            os.makedirs(os.path.dirname(self.cassette_path), exist_ok=True)
+        # Each recording session appends its own gzip member
+        self.file = gzip.open(self.cassette_path, 'at', encoding='utf-8')
+        self.write({'cassette': CASSETTE_VERSION, 'recorded': datetime.now().isoformat(timespec='seconds'),
+                    'query': self.query})
+        logger.info("Recording cassette", extra={'file': self.cassette_path})
+        return True
+
+    def write(self, entry):
+        with self.write_lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def call(self, method, http=None, **params):
+        start = time.perf_counter()
+        entry = {'key': request_key(method, params), 'method': method}
+        try:
+            response = super().call(method, http=http, **params)
+        except HttpError as error:
+            entry.update(elapsed=round(time.perf_counter() - start, 4),
+                         error={'status': getattr(error.resp, 'status', None),
+                                'reason': getattr(error.resp, 'reason', None)})
+            self.write(entry)
+            raise
+        entry.update(elapsed=round(time.perf_counter() - start, 4),
+                     response=self.scrubber.response(method, response))
+        self.write(entry)
+        return response
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class ReplayResponse(dict):
+    """Enough of an httplib2 response for HttpError and the rate limiter"""
+
+    def __init__(self, status, reason):
+        super().__init__(status=str(status))
+        self.status = status
+        self.reason = reason
+
+
+class ReplaySource(GmailSource):
+    """GmailSource that answers every call from a cassette"""
+
+    name = "gmail_replay"
+
+    def __init__(self, cassette_path, recorded_timing=False, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette_path = cassette_path
+        self.recorded_timing = recorded_timing
+        self.entries = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """Load the cassette; no authentication or network needed"""
+        if not os.path.exists(self.cassette_path):
+            logger.error("Cassette not found", extra={'file': self.cassette_path})
+            return False
+
+        entries = {}
+        with gzip.open(self.cassette_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if 'key' in entry:
+                    entries.setdefault(entry['key'], deque()).append(entry)
+        self.entries = entries
+        logger.info("Replaying cassette", extra={'file': self.cassette_path,
+                                                 'requests': sum(map(len, entries.values())),
+                                                 'recorded_timing': self.recorded_timing})
+        return True
+
+    def connected(self):
+        return self.entries is not None
+
+    def call(self, method, http=None, **params):
+        key = request_key(method, params)
+        with self.lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                entry = None
+            elif len(recorded) > 1:
+                entry = recorded.popleft()
+            else:
+                # The last recording of a call answers any further repeats
+                entry = recorded[0]
+
+        if entry is None:
+            logger.warning("Request not in cassette", extra={'key': key})
+            raise HttpError(ReplayResponse(404, "Not in cassette"), b"{}")
+
+        if self.recorded_timing:
+            time.sleep(entry['elapsed'])
+        if 'error' in entry:
+            error = entry['error']
+            raise HttpError(ReplayResponse(error['status'], error['reason']), b"{}")
+        return entry['response']
@@ -0,0 +1,54 @@
+"""
+Dashboard.md writer shared by the cycle-end update and the live dashboard
+Replaces the bullet lines under selected "## Heading" sections and keeps
+everything else in the file as it is.
+"""
+
+import os
+from datetime import datetime
+
+STATUS_HEADING = "## Status Overview"
+ACTIVITY_HEADING = "## Recent Activity"
+
+
+def status_lines(needs_action_count, done_count, system_status="Active"):
+    """Bullet lines for the Status Overview section"""
+    return [
+        f"- **Active Tasks**: {needs_action_count}\n",
+        f"- **Completed Tasks**: {done_count}\n",
+        f"- **System Status**: {system_status}\n",
+        f"- **Last Updated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+    ]
+
+
+def write_dashboard(dashboard_file, sections):
+    """Rewrite the bullet lines of each heading in sections ({heading: lines})"""
+    # Read existing dashboard content
+    if os.path.exists(dashboard_file):
+        with open(dashboard_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    else:
+        lines = []
+
+    # Find and update each section
+    new_lines = []
+    in_section = False
+
+    for line in lines:
+        if line.strip() in sections:
+            new_lines.append(line)
+            new_lines.extend(sections[line.strip()])
+            in_section = True
+        elif in_section and line.startswith("-"):
+            # Skip old section lines
+            continue
+        elif in_section and line.startswith("##"):
+            # End of section, add the line and reset flag
+            new_lines.append(line)
+            in_section = False
+        else:
+            new_lines.append(line)
+
+    # Write updated content back to dashboard
+    with open(dashboard_file, 'w', encoding='utf-8') as f:
+        f.writelines(new_lines)
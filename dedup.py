@@ -0,0 +1,162 @@
+"""
+Near-duplicate email detection with SimHash and an LSH band index
+Automated alerts and mailing-list mail often differ only in timestamps,
+counters or IDs. Each email gets a 64-bit SimHash of its normalized
+subject and body; numbers, hex IDs and the like are replaced with
+placeholders first so they do not change the fingerprint.
+
+The index splits every fingerprint into 4 bands of 16 bits. Two
+fingerprints within Hamming distance 3 always share at least one band,
+so a lookup only compares against the few entries in 4 buckets and
+stays well under a millisecond even with millions of fingerprints.
+
+Persisted in the vault, append-only:
+- .dedup/fingerprints.tsv   simhash, note ID and sender per original
+- .dedup/collapsed.txt      message IDs folded into an existing note
+Several processes can share a vault, so before every lookup each index
+reads only the lines appended since its last read.
+"""
+
+import os
+import re
+import hashlib
+import threading
+
+DEDUP_DIR_NAME = ".dedup"
+FINGERPRINTS_FILE = "fingerprints.tsv"
+COLLAPSED_FILE = "collapsed.txt"
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_DISTANCE = 3
+# Short texts give unreliable fingerprints, so they are never collapsed
+MIN_TOKENS = 8
+
+_VOLATILE = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b'), ' <uuid> '),
+    (re.compile(r'\b[0-9a-f]{12,}\b'), ' <hex> '),
+    (re.compile(r'\b\d{1,4}[-/:.]\d{1,2}[-/:.]\d{1,4}(?:[ t]\d{1,2}:\d{2}(?::\d{2})?)?\b'), ' <date> '),
+    (re.compile(r'\d+'), ' <num> '),
+]
+_TOKEN = re.compile(r'<\w+>|\w+')
+
+
+def tokens(text):
+    """Lowercased tokens with volatile values replaced by placeholders"""
+    text = text.lower()
+    for pattern, placeholder in _VOLATILE:
+        text = pattern.sub(placeholder, text)
+    return _TOKEN.findall(text)
+
+
+def simhash(words):
+    """64-bit SimHash over word bigrams"""
+    features = [f"{a} {b}" for a, b in zip(words, words[1:])] or words
+    weights = [0] * BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    value = 0
+    for bit in range(BITS):
+        if weights[bit] > 0:
+            value |= 1 << bit
+    return value
+
+
+def fingerprint(email):
+    """SimHash for an email, or None if it is too short to judge"""
+    words = tokens(f"{email.subject}\n{email.body}")
+    if len(words) < MIN_TOKENS:
+        return None
+    return simhash(words)
+
+
+def read_appended(path, offset):
+    """Complete lines appended to path after offset, and the offset after them"""
+    try:
+        if os.path.getsize(path) <= offset:
+            return [], offset
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], offset
+    # A line still being written by another process is read next time
+    end = data.rfind(b'\n') + 1
+    return data[:end].decode('utf-8').splitlines(), offset + end
+
+
+class DuplicateIndex:
+    def __init__(self, vault_path, max_distance=MAX_DISTANCE):
+        self.dedup_path = os.path.join(vault_path, DEDUP_DIR_NAME)
+        self.fingerprints_file = os.path.join(self.dedup_path, FINGERPRINTS_FILE)
+        self.collapsed_file = os.path.join(self.dedup_path, COLLAPSED_FILE)
+        self.max_distance = max_distance
+
+        self.bands = [{} for _ in range(BANDS)]
+        # Insertion order of fingerprints, so lookups can prefer the newest
+        self.count = 0
+        self.collapsed = set()
+        # How far each file has been read
+        self.fingerprints_offset = 0
+        self.collapsed_offset = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Read whatever was appended to the persisted index since the last call"""
+        with self.lock:
+            lines, self.fingerprints_offset = read_appended(self.fingerprints_file,
+                                                            self.fingerprints_offset)
+            for line in lines:
+                value, note_id, sender = line.split('\t')
+                self._insert(int(value, 16), note_id, sender)
+
+            lines, self.collapsed_offset = read_appended(self.collapsed_file, self.collapsed_offset)
+            self.collapsed.update(line.strip() for line in lines if line.strip())
+
+    def _insert(self, value, note_id, sender):
+        self.count += 1
+        entry = (self.count, value, note_id, sender)
+        for band in range(BANDS):
+            key = value >> (band * BAND_BITS) & BAND_MASK
+            self.bands[band].setdefault(key, []).append(entry)
+
+    def find(self, value, sender):
+        """Note ID of the newest near-duplicate from the same sender, or None"""
+        self.load()
+        sender = sender.replace('\t', ' ')
+        # The newest original is the one least likely to be archived already
+        best = None
+        for band in range(BANDS):
+            key = value >> (band * BAND_BITS) & BAND_MASK
+            for entry in self.bands[band].get(key, ()):
+                seq, other, note_id, other_sender = entry
+                if (other_sender == sender and (best is None or seq > best[0]) and
+                        bin(value ^ other).count('1') <= self.max_distance):
+                    best = entry
+        return best[2] if best else None
+
+    def add(self, value, note_id, sender):
+        """Remember an original email's fingerprint"""
+        sender = sender.replace('\t', ' ')
+        # Only appended here; the next load picks it up like any other
+        # worker's entry, so it is never inserted twice
+        with self.lock:
+            os.makedirs(self.dedup_path, exist_ok=True)
+            with open(self.fingerprints_file, 'a', encoding='utf-8') as f:
+                f.write(f"{value:016x}\t{note_id}\t{sender}\n")
+
+    def is_collapsed(self, message_id):
+        self.load()
+        return message_id in self.collapsed
+
+    def mark_collapsed(self, message_id):
+        """Remember a message that was folded into an existing note"""
+        with self.lock:
+            self.collapsed.add(message_id)
+            os.makedirs(self.dedup_path, exist_ok=True)
+            with open(self.collapsed_file, 'a', encoding='utf-8') as f:
+                f.write(message_id + "\n")
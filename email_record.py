@@ -0,0 +1,99 @@
+"""
+Compact email record used throughout the pipeline
+Replaces the plain dicts that carried every email's fully decoded body.
+The record keeps only what the pipeline reads later: a reference to the
+encoded text/plain body, the attachment parts and the few headers used
+for priority classification. The raw Gmail response is not kept alive.
+The body is decoded the first time it is read, and the encoded copy is
+dropped then, so a record never holds the body twice.
+"""
+
+import base64
+from datetime import datetime
+
+from attachments import iter_attachment_parts
+
+# Headers kept on the record, besides Subject and From (lowercase)
+KEPT_HEADERS = ('list-unsubscribe', 'precedence')
+
+
+def body_data(payload):
+    """Base64url data of the text/plain body of a Gmail message payload, or None"""
+    if 'parts' in payload:
+        # Handle multipart messages
+        for part in payload['parts']:
+            if part['mimeType'] == 'text/plain':
+                return part['body'].get('data')
+        return None
+
+    # Handle simple text messages
+    return payload.get('body', {}).get('data')
+
+
+def decode_data(data):
+    """Text of base64url body data; empty for None"""
+    return base64.urlsafe_b64decode(data.encode('ASCII')).decode('utf-8') if data else ""
+
+
+def decode_body(payload):
+    """Extract the text/plain body from a Gmail message payload"""
+    return decode_data(body_data(payload))
+
+
+class Email:
+    """One email; the body is decoded lazily from its encoded data"""
+
+    __slots__ = ('id', 'thread_id', 'subject', 'sender', 'timestamp', 'received',
+                 'headers', 'attachments', '_body_data', '_body')
+
+    def __init__(self, id, subject, sender, timestamp, body=None, thread_id=None,
+                 received=None, body_data=None, headers=(), attachments=()):
+        self.id = id
+        self.thread_id = thread_id
+        self.subject = subject
+        self.sender = sender
+        self.timestamp = timestamp
+        # When Gmail received the message; falls back to when we saw it
+        self.received = received or timestamp
+        # (lowercase name, value) pairs for KEPT_HEADERS only
+        self.headers = tuple(headers)
+        # Payload parts carrying a named attachment
+        self.attachments = tuple(attachments)
+        self._body_data = body_data
+        self._body = body
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = decode_data(self._body_data)
+            self._body_data = None
+        return self._body
+
+    @classmethod
+    def from_gmail(cls, message, timestamp):
+        """Build a record from a users.messages.get response"""
+        payload = message['payload']
+        subject = ''
+        sender = ''
+        headers = []
+
+        for header in payload['headers']:
+            name = header['name']
+            if name == 'Subject':
+                subject = header['value']
+            elif name == 'From':
+                sender = header['value']
+            elif name.lower() in KEPT_HEADERS:
+                headers.append((name.lower(), header['value']))
+
+        received = None
+        if 'internalDate' in message:
+            received = datetime.fromtimestamp(int(message['internalDate']) / 1000).isoformat()
+
+        return cls(message['id'], subject, sender, timestamp,
+                   thread_id=message.get('threadId'), received=received,
+                   body_data=body_data(payload), headers=headers,
+                   attachments=iter_attachment_parts(payload))
+
+    def __repr__(self):
+        return f"Email(id={self.id!r}, subject={self.subject!r})"
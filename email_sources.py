@@ -0,0 +1,290 @@
+"""
+Email sources for the shared pipeline
+A source lists message IDs and fetches single messages as Email records;
+the pipeline (pipeline.py) does everything else. All sources here build
+Gmail-shaped messages and go through Email.from_gmail, so mock and
+benchmark runs exercise the same parsing path as real mail:
+- MockSource         the three fixed demo emails
+- SyntheticSource    a deterministic generator of any number of emails
+- LocalServerSource  a Gmail-compatible HTTP server (fake_gmail_server.py)
+The real mailbox is GmailSource in gmail_source.py, kept apart because
+it needs the Google client libraries.
+"""
+
+import json
+import base64
+import random
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+
+from email_record import Email
+from attachments import iter_attachment_parts
+
+# Fixed start for synthetic internalDate values so runs are repeatable
+SYNTHETIC_EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+
+SYNTHETIC_SENDERS = ('boss@company.com', 'hr@company.com', 'manager@company.com',
+                     'client@partner.com', 'noreply@alerts.example.com',
+                     'newsletter@news.example.com')
+SYNTHETIC_TOPICS = ('quarterly budget', 'team meeting', 'project deadline', 'contract renewal',
+                    'hiring plan', 'customer escalation', 'release schedule', 'office move')
+SYNTHETIC_WORDS = ('please', 'review', 'the', 'attached', 'numbers', 'before', 'friday', 'and',
+                   'let', 'me', 'know', 'if', 'anything', 'needs', 'to', 'change', 'we', 'agreed',
+                   'on', 'update', 'plan', 'team', 'schedule', 'approve', 'draft', 'notes')
+
+
+def gmail_message(msg_id, subject, sender, body, internal_date=None, thread_id=None,
+                  headers=(), attachments=()):
+    """A users.messages.get style response for the given content"""
+    def encode(data):
+        return base64.urlsafe_b64encode(data).decode('ASCII')
+
+    payload = {
+        'mimeType': 'text/plain',
+        'headers': [{'name': 'Subject', 'value': subject},
+                    {'name': 'From', 'value': sender}] + list(headers),
+        'body': {'data': encode(body.encode('utf-8'))},
+    }
+    if attachments:
+        parts = [{'partId': '0', 'mimeType': 'text/plain', 'body': payload.pop('body')}]
+        for i, (filename, data) in enumerate(attachments, start=1):
+            parts.append({'partId': str(i), 'mimeType': 'application/octet-stream',
+                          'filename': filename, 'body': {'data': encode(data), 'size': len(data)}})
+        payload.update(mimeType='multipart/mixed', parts=parts)
+
+    message = {'id': msg_id, 'threadId': thread_id or msg_id, 'payload': payload}
+    if internal_date is not None:
+        message['internalDate'] = str(internal_date)
+    return message
+
+
+def synthetic_message(index, seed=0, prefix="syn"):
+    """Deterministic synthetic Gmail message number index"""
+    rng = random.Random(f"{seed}:{index}")
+    msg_id = f"{prefix}{index:08d}"
+    sender = rng.choice(SYNTHETIC_SENDERS)
+    internal_date = SYNTHETIC_EPOCH_MS + index * 60000
+    headers = []
+    attachments = []
+
+    if sender.startswith('noreply'):
+        # Monitoring alerts: the same text with changing numbers and IDs
+        host = rng.randrange(4)
+        subject = f"Disk usage alert on web-{host}"
+        body = (f"Disk usage on host web-{host} reached {rng.randrange(80, 100)}% at "
+                f"{datetime.fromtimestamp(internal_date / 1000, timezone.utc):%Y-%m-%d %H:%M:%S}. "
+                f"Incident {rng.getrandbits(64):016x}. Please check the server and free space.")
+    else:
+        topic = rng.choice(SYNTHETIC_TOPICS)
+        subject = f"{'Urgent: ' if rng.random() < 0.1 else ''}{topic.capitalize()} #{index}"
+        body = f"Hello, about the {topic}: " + " ".join(
+            rng.choice(SYNTHETIC_WORDS) for _ in range(rng.randrange(20, 200))) + "."
+        if sender.startswith('newsletter'):
+            headers.append({'name': 'List-Unsubscribe', 'value': f"<mailto:unsubscribe@{sender}>"})
+        if rng.random() < 0.05:
+            # A handful of shared documents, so the blob store sees repeats
+            doc = rng.randrange(5)
+            attachments.append((f"document-{doc}.pdf", f"%PDF-1.4 document {doc}\n".encode() * 64))
+
+    return gmail_message(msg_id, subject, sender, body, internal_date,
+                         thread_id=f"thread{index // 3:08d}", headers=headers,
+                         attachments=attachments)
+
+
+def message_attachment(message, attachment_id):
+    """Base64url data of the attachment part with this attachmentId (or partId) in a message"""
+    for part in iter_attachment_parts(message['payload']):
+        body = part['body']
+        if attachment_id in (body.get('attachmentId'), part.get('partId')) and body.get('data'):
+            return body['data']
+    raise KeyError(f"No attachment {attachment_id} in message {message['id']}")
+
+
+class EmailSource:
+    """Where the pipeline gets its email from"""
+
+    name = "source"
+    # Exception types raised for a single failed request; the pipeline
+    # skips that message and carries on with the rest
+    errors = ()
+    page_size = 100
+
+    def connect(self):
+        """Prepare the source (authenticate, open connections); False on failure"""
+        return True
+
+    def list_page(self, page_token=None, page_size=None):
+        """One page of recent message IDs and the next page token, None after the last page"""
+        raise NotImplementedError
+
+    def iter_message_ids(self, max_total=None):
+        """Yield IDs of recent messages, newest first, page by page"""
+        page_token = None
+        yielded = 0
+
+        while True:
+            page_size = self.page_size
+            if max_total is not None:
+                page_size = min(page_size, max_total - yielded)
+
+            ids, page_token = self.list_page(page_token, page_size)
+            for msg_id in ids:
+                yield msg_id
+                yielded += 1
+                if max_total is not None and yielded >= max_total:
+                    return
+
+            if not page_token:
+                return
+
+    def fetch_email(self, msg_id):
+        """Fetch a single message as an Email record"""
+        raise NotImplementedError
+
+    def fetch_attachment(self, message_id, attachment_id):
+        """Base64url data of an attachment that is not inline in the payload"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release connections and flush anything buffered"""
+
+
+class MessageCursor:
+    """
+    Resumable position in a source's listing: the unread rest of the
+    current page and the next page token. Plain data, so callers that
+    work through a mailbox in slices (possibly in different processes)
+    can hand it along instead of listing from the first page again.
+    """
+
+    def __init__(self):
+        self.ids = deque()
+        self.page_token = None
+        self.started = False
+        self.failed = False
+
+    @property
+    def exhausted(self):
+        """True once every listed ID was handed out, or listing failed"""
+        return self.failed or (self.started and not self.ids and not self.page_token)
+
+    def iter_message_ids(self, source):
+        """Yield the remaining IDs, listing further pages from source as needed"""
+        while True:
+            while self.ids:
+                yield self.ids.popleft()
+            if self.exhausted:
+                return
+            try:
+                ids, self.page_token = source.list_page(self.page_token)
+            except source.errors:
+                self.failed = True
+                raise
+            self.started = True
+            self.ids.extend(ids)
+
+
+class MessageListSource(EmailSource):
+    """Source backed by Gmail-shaped message dicts kept in memory"""
+
+    name = "memory"
+
+    def __init__(self, messages):
+        self.messages = {message['id']: message for message in messages}
+
+    def list_page(self, page_token=None, page_size=None):
+        # Page tokens are plain offsets into the message list
+        ids = list(self.messages)
+        start = int(page_token or 0)
+        end = min(len(ids), start + (page_size or self.page_size))
+        return ids[start:end], (str(end) if end < len(ids) else None)
+
+    def fetch_email(self, msg_id):
+        return Email.from_gmail(self.messages[msg_id], datetime.now().isoformat())
+
+    def fetch_attachment(self, message_id, attachment_id):
+        return message_attachment(self.messages[message_id], attachment_id)
+
+
+class MockSource(MessageListSource):
+    """The three fixed demo emails used by ai_employee_mock.py and ai_employee_simple.py"""
+
+    name = "mock"
+
+    def __init__(self):
+        super().__init__([
+            gmail_message('mock1', 'Quarterly Budget Review Required', 'boss@company.com',
+                          'Please review and approve the quarterly budget by end of week.'),
+            gmail_message('mock2', 'Team Meeting Tomorrow', 'hr@company.com',
+                          'Reminder about the team meeting tomorrow at 10 AM in conference room.'),
+            gmail_message('mock3', 'Project Deadline Update', 'manager@company.com',
+                          'The project deadline has been moved to next Friday. '
+                          'Please adjust your plans accordingly.'),
+        ])
+
+
+class SyntheticSource(EmailSource):
+    """Generates count deterministic emails on demand, for load and benchmark runs"""
+
+    name = "synthetic"
+
+    def __init__(self, count=1000, seed=0, prefix="syn"):
+        self.count = count
+        self.seed = seed
+        self.prefix = prefix
+
+    def iter_message_ids(self, max_total=None):
+        total = self.count if max_total is None else min(self.count, max_total)
+        for index in range(total):
+            yield self.message_id(index)
+
+    def list_page(self, page_token=None, page_size=None):
+        start = int(page_token or 0)
+        end = min(self.count, start + (page_size or self.page_size))
+        return ([self.message_id(index) for index in range(start, end)],
+                str(end) if end < self.count else None)
+
+    def message_id(self, index):
+        return f"{self.prefix}{index:08d}"
+
+    def message(self, msg_id):
+        return synthetic_message(int(msg_id[len(self.prefix):]), self.seed, self.prefix)
+
+    def fetch_email(self, msg_id):
+        return Email.from_gmail(self.message(msg_id), datetime.now().isoformat())
+
+    def fetch_attachment(self, message_id, attachment_id):
+        return message_attachment(self.message(message_id), attachment_id)
+
+
+class LocalServerSource(EmailSource):
+    """Reads mail over HTTP from a local Gmail-compatible server"""
+
+    name = "local_server"
+    errors = (urllib.error.URLError, ValueError)
+
+    def __init__(self, base_url="http://127.0.0.1:8766", page_size=100, timeout=10):
+        self.base_url = base_url.rstrip('/') + "/gmail/v1/users/me"
+        self.page_size = page_size
+        self.timeout = timeout
+
+    def get_json(self, path, **params):
+        query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        url = f"{self.base_url}/{path}" + (f"?{query}" if query else "")
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def list_page(self, page_token=None, page_size=None):
+        results = self.get_json("messages", maxResults=page_size or self.page_size, pageToken=page_token)
+        return [msg['id'] for msg in results.get('messages', [])], results.get('nextPageToken')
+
+    def fetch_email(self, msg_id):
+        message = self.get_json(f"messages/{urllib.parse.quote(msg_id)}")
+        return Email.from_gmail(message, datetime.now().isoformat())
+
+    def fetch_attachment(self, message_id, attachment_id):
+        path = f"messages/{urllib.parse.quote(message_id)}/attachments/{urllib.parse.quote(attachment_id)}"
+        return self.get_json(path)['data']
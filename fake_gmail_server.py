@@ -0,0 +1,134 @@
+"""
+Local Gmail-compatible HTTP server for load tests
+Serves deterministic synthetic mail (see email_sources.synthetic_message)
+on the same paths and JSON shapes as the Gmail REST API, with optional
+per-request latency, so LocalServerSource runs the full pipeline over a
+real socket without touching a mailbox:
+- GET /gmail/v1/users/me/messages?maxResults=&pageToken=
+- GET /gmail/v1/users/me/messages/<id>
+- GET /gmail/v1/users/me/messages/<id>/attachments/<part id>
+
+Usage: python fake_gmail_server.py [message_count] [port] [latency_ms]
+"""
+
+import sys
+import json
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from email_sources import SyntheticSource
+from attachments import iter_attachment_parts
+from logging_setup import setup_logging, get_logger
+
+DEFAULT_PORT = 8766
+API_PREFIX = "/gmail/v1/users/me/messages"
+
+logger = get_logger("fake_gmail_server")
+
+
+class FakeGmailServer:
+    def __init__(self, count=1000, port=DEFAULT_PORT, host="127.0.0.1", latency=0.0, seed=0):
+        self.source = SyntheticSource(count, seed)
+        self.port = port
+        self.host = host
+        self.latency = latency
+        self.server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def list_page(self, max_results, page_token):
+        start = int(page_token or 0)
+        end = min(self.source.count, start + max_results)
+        ids = [self.source.message_id(index) for index in range(start, end)]
+        page = {'messages': [{'id': msg_id, 'threadId': msg_id} for msg_id in ids],
+                'resultSizeEstimate': self.source.count}
+        if end < self.source.count:
+            page['nextPageToken'] = str(end)
+        return page
+
+    def message(self, msg_id):
+        """messages.get response; attachment data is left to the attachments endpoint, as in Gmail"""
+        message = self.source.message(msg_id)
+        for part in iter_attachment_parts(message['payload']):
+            part['body'] = {'attachmentId': part['partId'], 'size': part['body']['size']}
+        return message
+
+    def attachment(self, msg_id, part_id):
+        for part in iter_attachment_parts(self.source.message(msg_id)['payload']):
+            if part.get('partId') == part_id:
+                return {'data': part['body']['data'], 'size': part['body']['size']}
+        return None
+
+    def start(self):
+        """Serve on a background thread; port 0 picks a free port"""
+        handler = type('FakeGmailHandler', (FakeGmailRequestHandler,), {'gmail': self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info("Fake Gmail server started", extra={'url': self.base_url, 'count': self.source.count})
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class FakeGmailRequestHandler(BaseHTTPRequestHandler):
+    gmail = None
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX):
+            self.send_error(404)
+            return
+        if self.gmail.latency:
+            time.sleep(self.gmail.latency)
+
+        parts = [urllib.parse.unquote(p) for p in url.path[len(API_PREFIX):].split('/') if p]
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if not parts:
+                body = self.gmail.list_page(int(params.get('maxResults', 100)), params.get('pageToken'))
+            elif len(parts) == 1:
+                body = self.gmail.message(parts[0])
+            elif len(parts) == 3 and parts[1] == 'attachments':
+                body = self.gmail.attachment(parts[0], parts[2])
+            else:
+                body = None
+        except ValueError:
+            body = None  # Not one of our message IDs
+
+        if body is None:
+            self.send_error(404)
+            return
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    setup_logging()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+
+    server = FakeGmailServer(count, port, latency=latency)
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
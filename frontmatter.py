@@ -0,0 +1,79 @@
+"""
+YAML frontmatter for EMAIL/PLAN notes
+Notes start with a small "---" delimited block of key: value pairs so
+tools can get note metadata without parsing the markdown body. Values
+are written as JSON strings, which are valid YAML double-quoted scalars,
+so Obsidian and any YAML parser read them as-is while this module needs
+no YAML dependency.
+"""
+
+import os
+import json
+
+DELIMITER = "---"
+
+# Field order used when writing notes
+NOTE_FIELDS = ('message_id', 'thread_id', 'sender', 'subject', 'received', 'priority', 'status')
+
+
+def render_frontmatter(meta):
+    """Frontmatter block (with trailing newline) for a metadata dict"""
+    lines = [DELIMITER]
+    for key in NOTE_FIELDS + tuple(k for k in meta if k not in NOTE_FIELDS):
+        if key in meta and meta[key] is not None:
+            lines.append(f"{key}: {json.dumps(str(meta[key]), ensure_ascii=False)}")
+    lines.append(DELIMITER)
+    return "\n".join(lines) + "\n"
+
+
+def parse_value(raw):
+    raw = raw.strip()
+    if raw.startswith('"'):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            pass
+    return raw.strip("'")
+
+
+def read_frontmatter(path):
+    """Read only the frontmatter block of a note; returns {} if it has none"""
+    meta = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        if f.readline().strip() != DELIMITER:
+            return meta
+
+        # Stop at the closing delimiter so the body is never read
+        for line in f:
+            if line.strip() == DELIMITER:
+                break
+            key, sep, value = line.partition(':')
+            if sep:
+                meta[key.strip()] = parse_value(value)
+
+    return meta
+
+
+def update_frontmatter(path, updates):
+    """Merge updates into a note's frontmatter, rewriting the note atomically"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    meta = {}
+    body = content
+    lines = content.split('\n')
+    if lines and lines[0].strip() == DELIMITER:
+        for i, line in enumerate(lines[1:], start=1):
+            if line.strip() == DELIMITER:
+                body = '\n'.join(lines[i + 1:])
+                break
+            key, sep, value = line.partition(':')
+            if sep:
+                meta[key.strip()] = parse_value(value)
+
+    meta.update(updates)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render_frontmatter(meta) + body)
+    os.replace(tmp_path, path)
+    return meta
@@ -12,15 +12,18 @@ from googleapiclient.discovery import build
 # Scopes required for reading Gmail
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
-def authenticate_gmail():
+def authenticate_gmail(token_file='token.pickle', credentials_file='credentials.json'):
     """
     Authenticate and return Gmail service object
+    
+    token_file and credentials_file default to the single-account layout;
+    the multi-account runner passes a separate token per mailbox.
     """
     creds = None
     
     # Token file stores the user's access and refresh tokens
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
+    if os.path.exists(token_file):
+        with open(token_file, 'rb') as token:
             creds = pickle.load(token)
     
     # If there are no valid credentials, request authorization
@@ -29,8 +32,8 @@ def authenticate_gmail():
             creds.refresh(Request())
         else:
             # You'll need to download credentials.json from Google Cloud Console
-            if not os.path.exists('credentials.json'):
-                print("Error: credentials.json not found!")
+            if not os.path.exists(credentials_file):
+                print(f"Error: {credentials_file} not found!")
                 print("Please download it from Google Cloud Console:")
                 print("1. Go to https://console.cloud.google.com/")
                 print("2. Create a new project or select existing one")
@@ -40,11 +43,14 @@ def authenticate_gmail():
                 return None
             
             flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
+                credentials_file, SCOPES)
             creds = flow.run_local_server(port=0)
         
         # Save credentials for next run
-        with open('token.pickle', 'wb') as token:
+        token_dir = os.path.dirname(token_file)
+        if token_dir:
+            os.makedirs(token_dir, exist_ok=True)
+        with open(token_file, 'wb') as token:
             pickle.dump(creds, token)
     
     # Build and return the Gmail service
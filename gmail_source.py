@@ -0,0 +1,107 @@
+"""
+Gmail mailbox as an email source for the shared pipeline
+Every request goes through the account's quota-aware rate limiter.
+"""
+
+import threading
+from datetime import datetime
+
+from googleapiclient.errors import HttpError
+from gmail_auth import authenticate_gmail
+from rate_limiter import GmailRateLimiter, TRANSIENT_ERRORS
+from email_record import Email
+from email_sources import EmailSource
+from logging_setup import get_logger
+
+# Gmail list page size
+PAGE_SIZE = 100
+
+# Query for unread important emails or emails from last 24 hours
+DEFAULT_QUERY = "newer_than:1d category:primary"  # Last 24 hours, primary category
+
+logger = get_logger("gmail")
+
+try:
+    import httplib2
+    import google_auth_httplib2
+except ImportError:
+    httplib2 = None
+    google_auth_httplib2 = None
+
+
+class GmailSource(EmailSource):
+    name = "gmail"
+    # Transport failures that outlast the limiter's retries skip one message too
+    errors = (HttpError,) + TRANSIENT_ERRORS
+
+    def __init__(self, token_file='token.pickle', credentials_file='credentials.json',
+                 rate_limiter=None, query=DEFAULT_QUERY, page_size=PAGE_SIZE):
+        self.token_file = token_file
+        self.credentials_file = credentials_file
+        # Gmail quota is per user, so each mailbox gets its own limiter
+        self.rate_limiter = rate_limiter or GmailRateLimiter()
+        self.query = query
+        self.page_size = page_size
+        self.service = None
+        self.local = threading.local()
+
+    def connect(self):
+        """Authenticate with Gmail"""
+        logger.info("Authenticating with Gmail")
+        self.service = authenticate_gmail(self.token_file, self.credentials_file)
+        if self.service:
+            logger.info("Authentication successful")
+            return True
+        else:
+            logger.error("Authentication failed")
+            return False
+
+    def connected(self):
+        return self.service is not None
+
+    def call(self, method, http=None, **params):
+        """Run a users.* API method such as 'messages.get' through the rate limiter"""
+        *resources, action = method.split('.')
+        resource = self.service.users()
+        for name in resources:
+            resource = getattr(resource, name)()
+        request = getattr(resource, action)(userId='me', **params)
+        return self.rate_limiter.execute(request, method, http=http)
+
+    def list_page(self, page_token=None, page_size=None):
+        """One messages.list page of IDs and its nextPageToken"""
+        results = self.call('messages.list', q=self.query, maxResults=page_size or self.page_size,
+                            pageToken=page_token)
+        return [msg['id'] for msg in results.get('messages', [])], results.get('nextPageToken')
+
+    def iter_message_ids(self, max_total=None):
+        """Yield IDs of recent emails page by page, following nextPageToken"""
+        if not self.connected():
+            logger.error("Not authenticated with Gmail")
+            return
+        yield from super().iter_message_ids(max_total)
+
+    def fetch_email(self, msg_id):
+        """Fetch a single email as an Email record"""
+        email_detail = self.call('messages.get', id=msg_id)
+
+        # The body stays encoded in the payload until something reads it
+        return Email.from_gmail(email_detail, datetime.now().isoformat())
+
+    def fetch_attachment(self, message_id, attachment_id):
+        response = self.call('messages.attachments.get', http=self.thread_http(),
+                             messageId=message_id, id=attachment_id)
+        return response['data']
+
+    def thread_http(self):
+        """Per-thread authorized http object, or None to use the service's own"""
+        # httplib2 is not thread-safe, so attachment fetches on worker
+        # threads each get their own connection
+        if threading.current_thread() is threading.main_thread() or google_auth_httplib2 is None:
+            return None
+        credentials = getattr(getattr(self.service, '_http', None), 'credentials', None)
+        if credentials is None:
+            return None
+        if not hasattr(self.local, 'http'):
+            self.local.http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        return self.local.http
@@ -0,0 +1,202 @@
+"""
+Live Dashboard Service for AI Employee Foundation
+Keeps status counters and a ring buffer of recent activity in memory,
+updated by the pipeline as events happen, and serves them locally:
+- GET /status  -> JSON snapshot of counters and recent activity
+- GET /events  -> server-sent events stream, one message per event
+Dashboard.md is still written, but only on a throttled schedule and
+only when something changed, instead of rescanning folders every cycle.
+"""
+
+import os
+import json
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from retention import archived_count
+from logging_setup import get_logger
+from dashboard import STATUS_HEADING, ACTIVITY_HEADING, status_lines, write_dashboard
+
+DEFAULT_PORT = 8765
+RECENT_EVENTS = 50
+MARKDOWN_INTERVAL_SECONDS = 60
+SSE_KEEPALIVE_SECONDS = 15
+
+logger = get_logger("live_dashboard")
+
+
+class LiveDashboard:
+    def __init__(self, employee, port=DEFAULT_PORT, host="127.0.0.1",
+                 markdown_interval=MARKDOWN_INTERVAL_SECONDS):
+        self.dashboard_file = employee.dashboard_file
+        self.port = port
+        self.host = host
+        self.markdown_interval = markdown_interval
+
+        # One folder scan at startup; from then on events keep counts current
+        self.counters = {
+            'active_tasks': count_notes(employee.needs_action_path),
+            'completed_tasks': count_notes(employee.done_path) + archived_count(employee.vault_path),
+            'emails_processed': 0,
+            'plans_created': 0,
+            'skipped': 0,
+            'duplicates': 0,
+            'errors': 0,
+        }
+        self.system_status = "Active"
+        self.recent = deque(maxlen=RECENT_EVENTS)
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.dirty = True
+
+        self.server = None
+        self.stop_event = threading.Event()
+
+    def record(self, event, **details):
+        """Record a pipeline event: update counters, buffer it, notify streams"""
+        entry = {'time': datetime.now().isoformat(timespec='seconds'), 'event': event}
+        entry.update(details)
+
+        with self.lock:
+            if event == 'note_created':
+                self.counters['active_tasks'] += 1
+            elif event == 'plan_created':
+                self.counters['active_tasks'] += 1
+                self.counters['plans_created'] += 1
+            elif event == 'moved_to_done':
+                self.counters['active_tasks'] -= 1
+                self.counters['completed_tasks'] += 1
+            elif event == 'email_processed':
+                self.counters['emails_processed'] += 1
+            elif event == 'skipped':
+                self.counters['skipped'] += 1
+            elif event == 'duplicate':
+                self.counters['duplicates'] += 1
+            elif event == 'error':
+                self.counters['errors'] += 1
+
+            self.recent.append(entry)
+            self.dirty = True
+            subscribers = list(self.subscribers)
+
+        for subscriber in subscribers:
+            subscriber.put(entry)
+
+    def set_status(self, status):
+        """Change the System Status shown on the dashboard"""
+        with self.lock:
+            if status != self.system_status:
+                self.system_status = status
+                self.dirty = True
+
+    def snapshot(self):
+        """Current counters and recent activity as a JSON-ready dict"""
+        with self.lock:
+            return {
+                'system_status': self.system_status,
+                'counters': dict(self.counters),
+                'recent_activity': list(self.recent),
+            }
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def write_markdown(self, force=False):
+        """Write Dashboard.md from memory if anything changed since last write"""
+        with self.lock:
+            if not (self.dirty or force):
+                return False
+            counters = dict(self.counters)
+            recent = list(self.recent)[-10:]
+            self.dirty = False
+
+        activity = [f"- {e['time']} {e['event']}: {e.get('subject', e.get('file', ''))}\n"
+                    for e in reversed(recent)] or ["- No activity recorded yet\n"]
+        write_dashboard(self.dashboard_file, {
+            STATUS_HEADING: status_lines(counters['active_tasks'], counters['completed_tasks'],
+                                         self.system_status),
+            ACTIVITY_HEADING: activity,
+        })
+        return True
+
+    def _markdown_loop(self):
+        while not self.stop_event.wait(self.markdown_interval):
+            self.write_markdown()
+
+    def start(self):
+        """Start the HTTP server and the throttled Dashboard.md writer"""
+        handler = type('LiveDashboardHandler', (DashboardRequestHandler,), {'dashboard': self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._markdown_loop, daemon=True).start()
+        logger.info("Live dashboard started",
+                    extra={'url': f"http://{self.host}:{self.server.server_address[1]}/status"})
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.write_markdown()
+
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    dashboard = None
+
+    def do_GET(self):
+        if self.path == '/status':
+            body = json.dumps(self.dashboard.snapshot()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == '/events':
+            self.stream_events()
+        else:
+            self.send_error(404)
+
+    def stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        q = self.dashboard.subscribe()
+        try:
+            while not self.dashboard.stop_event.is_set():
+                try:
+                    entry = q.get(timeout=SSE_KEEPALIVE_SECONDS)
+                    message = f"event: {entry['event']}\ndata: {json.dumps(entry)}\n\n"
+                except queue.Empty:
+                    message = ": keepalive\n\n"
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.dashboard.unsubscribe(q)
+
+    def log_message(self, format, *args):
+        # Keep request logging off the pipeline's output
+        pass
+
+
+def count_notes(folder):
+    """Number of markdown notes in a folder"""
+    if not os.path.isdir(folder):
+        return 0
+    return len([f for f in os.listdir(folder) if f.endswith('.md')])
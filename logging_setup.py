@@ -0,0 +1,130 @@
+"""
+Structured, non-blocking logging shared by all entry points
+- Records are emitted as one JSON object per line
+- The pipeline only puts records on a queue; a background listener
+  thread does the actual writing, so stdout never blocks the hot path
+- Each email gets a correlation ID (its message ID) attached to every
+  record logged while it is being processed
+- Noisy per-item records (logged with extra={'sample': True}) are
+  sampled per email, so an email's trail is either kept or dropped whole
+
+Environment:
+  AI_EMPLOYEE_LOG_LEVEL        default INFO
+  AI_EMPLOYEE_LOG_SAMPLE_RATE  fraction of emails whose per-item records
+                               are kept, default 1.0
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import zlib
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = "ai_employee"
+
+correlation_id = contextvars.ContextVar('correlation_id', default=None)
+
+# LogRecord attributes that are not user-supplied extra fields
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'sample'}
+
+_listener = None
+
+
+def get_logger(name=None):
+    """Logger under the shared ai_employee namespace"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+@contextmanager
+def correlation(value):
+    """Attach a correlation ID to every record logged inside the block"""
+    token = correlation_id.set(str(value))
+    try:
+        yield
+    finally:
+        correlation_id.reset(token)
+
+
+class CorrelationFilter(logging.Filter):
+    def filter(self, record):
+        record.correlation_id = correlation_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fixed fraction of emails' per-item records; warnings always pass"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.threshold = int(max(0.0, min(1.0, rate)) * 0xFFFFFFFF)
+
+    def filter(self, record):
+        if not getattr(record, 'sample', False) or record.levelno >= logging.WARNING:
+            return True
+        key = getattr(record, 'correlation_id', None) or record.getMessage()
+        return zlib.crc32(key.encode('utf-8')) <= self.threshold
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'correlation_id', None):
+            entry['correlation_id'] = record.correlation_id
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and key != 'correlation_id':
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def setup_logging(level=None, sample_rate=None, stream=None, force=False):
+    """Route ai_employee logs through a queue to a JSON stream handler (idempotent)"""
+    global _listener
+    if _listener is not None and not force:
+        return get_logger()
+
+    logger = get_logger()
+    # A forked worker inherits the parent's handler but not its listener thread
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    level = level or os.environ.get("AI_EMPLOYEE_LOG_LEVEL", "INFO")
+    if sample_rate is None:
+        sample_rate = float(os.environ.get("AI_EMPLOYEE_LOG_SAMPLE_RATE", "1.0"))
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # Filters run in the caller's thread, where the correlation ID is set
+    queue_handler.addFilter(CorrelationFilter())
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
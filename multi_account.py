@@ -0,0 +1,228 @@
+"""
+Multi-Account Runner for AI Employee Foundation
+Runs many Gmail mailboxes across a pool of worker processes:
+1. Each account gets its own token file and vault subtree
+2. Work is handed out in small slices, round-robin, so one huge
+   mailbox cannot starve the others; a slice is one pipeline cycle
+   capped at a few emails, carrying on where the last slice stopped
+3. Throughput is reported per account after every round
+
+Accounts are listed in a JSON file, for example accounts.json:
+[
+    {"name": "sales", "token": "tokens/sales.pickle", "vault": "vaults/sales"},
+    {"name": "support", "token": "tokens/support.pickle", "vault": "vaults/support"}
+]
+
+Authorize each account once up front (python gmail_auth.py style) so that
+worker processes never have to open a browser.
+"""
+
+import os
+import sys
+import json
+import time
+from queue import SimpleQueue
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.util import Finalize
+
+from ai_employee import AIEmployee
+from email_sources import MessageCursor
+from logging_setup import setup_logging, shutdown_logging, get_logger
+
+ACCOUNTS_FILE = "accounts.json"
+
+# How many emails one account may process before yielding to the next one
+DEFAULT_SLICE_SIZE = 5
+
+logger = get_logger("multi_account")
+
+# Per-process cache of authenticated AIEmployee instances, keyed by account name
+_employees = {}
+
+
+def load_accounts(accounts_file=ACCOUNTS_FILE, credentials_file='credentials.json'):
+    """Read the account list and fill in per-account defaults"""
+    with open(accounts_file, 'r', encoding='utf-8') as f:
+        accounts = json.load(f)
+
+    for account in accounts:
+        name = account['name']
+        account.setdefault('token', os.path.join('tokens', f"{name}.pickle"))
+        account.setdefault('vault', os.path.join('vaults', name))
+        account.setdefault('credentials', credentials_file)
+
+    return accounts
+
+
+def _init_worker():
+    """Give each worker process its own logging listener"""
+    setup_logging(force=True)
+    # Pool workers skip atexit, so flush queued records through a finalizer
+    Finalize(None, shutdown_logging, exitpriority=10)
+
+
+def _get_employee(account):
+    """Return a cached, authenticated AIEmployee for this worker process"""
+    employee = _employees.get(account['name'])
+    if employee is None:
+        employee = AIEmployee(
+            vault_path=account['vault'],
+            token_file=account['token'],
+            credentials_file=account['credentials']
+        )
+        employee.setup_directories()
+        if not employee.authenticate():
+            return None
+        _employees[account['name']] = employee
+    return employee
+
+
+def run_account_slice(account, cursor, slice_size=DEFAULT_SLICE_SIZE):
+    """
+    Process at most slice_size pending emails for one account, carrying on
+    from cursor in its message listing.
+    Returns (name, processed_count, elapsed_seconds, has_more, cursor).
+    """
+    start = time.time()
+    employee = _get_employee(account)
+    if employee is None:
+        return account['name'], 0, time.time() - start, False, cursor
+
+    # A regular pipeline cycle, so pending notes, admission control, the
+    # cycle budget and retention all apply; done and collapsed mail is
+    # skipped by the pipeline itself
+    processed = employee.run_cycle(max_emails=slice_size,
+                                   message_ids=cursor.iter_message_ids(employee.source))
+
+    return account['name'], processed, time.time() - start, not cursor.exhausted, cursor
+
+
+class MultiAccountRunner:
+    def __init__(self, accounts, processes=None, slice_size=DEFAULT_SLICE_SIZE):
+        self.accounts = accounts
+        self.processes = processes or min(len(accounts), os.cpu_count() or 1)
+        self.slice_size = slice_size
+
+        # Aggregate stats per account: emails processed and busy seconds
+        self.stats = {a['name']: {'emails': 0, 'seconds': 0.0, 'slices': 0}
+                      for a in accounts}
+        # Wall time of all rounds so far, matching the all-time stats above
+        self.wall_seconds = 0.0
+        # Kept across rounds so workers keep their authenticated accounts,
+        # loaded dedup indexes and once-a-day retention schedule
+        self.pool = None
+
+    def run_round(self):
+        """Drain all accounts once, scheduling slices round-robin"""
+        logger.info("Starting multi-account round",
+                    extra={'accounts': len(self.accounts), 'workers': self.processes})
+        round_start = time.time()
+
+        if self.pool is None:
+            self.pool = Pool(processes=self.processes, initializer=_init_worker)
+
+        queue = deque(self.accounts)
+        # Where each account's listing stands; slices may run on any
+        # worker, so the runner carries the cursors between them
+        cursors = {a['name']: MessageCursor() for a in self.accounts}
+        # Slices report here as they finish, so one slow slice does not
+        # hold up dispatch to workers that are already free
+        finished = SimpleQueue()
+        in_flight = 0
+
+        while queue or in_flight:
+            # Keep at most one slice per worker in flight; accounts with
+            # more work go to the back of the queue, which keeps it fair
+            while queue and in_flight < self.processes:
+                account = queue.popleft()
+                self.pool.apply_async(
+                    run_account_slice, (account, cursors[account['name']], self.slice_size),
+                    callback=lambda result, account=account: finished.put((account, result, None)),
+                    error_callback=lambda error, account=account: finished.put((account, None, error)))
+                in_flight += 1
+
+            account, result, error = finished.get()
+            in_flight -= 1
+            if error is not None:
+                logger.error("Account slice failed, skipping the account this round",
+                             extra={'account': account['name'], 'error': repr(error)})
+                continue
+
+            name, processed, elapsed, has_more, cursors[name] = result
+
+            stats = self.stats[name]
+            stats['emails'] += processed
+            stats['seconds'] += elapsed
+            stats['slices'] += 1
+
+            if has_more:
+                queue.append(account)
+
+        self.wall_seconds += time.time() - round_start
+        self.report()
+        logger.info("Round complete")
+
+    def close(self):
+        """Stop the worker pool, letting workers flush their log queues"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def report(self):
+        """Print aggregate throughput per account, over all rounds so far"""
+        total = 0
+        for name, stats in self.stats.items():
+            rate = stats['emails'] / stats['seconds'] if stats['seconds'] else 0.0
+            logger.info("Account throughput", extra={
+                'account': name, 'emails': stats['emails'], 'slices': stats['slices'],
+                'busy_seconds': round(stats['seconds'], 2), 'emails_per_second': round(rate, 2)})
+            total += stats['emails']
+
+        overall = total / self.wall_seconds if self.wall_seconds else 0.0
+        logger.info("Total throughput", extra={
+            'emails': total, 'wall_seconds': round(self.wall_seconds, 2),
+            'emails_per_second': round(overall, 2)})
+
+    def start_monitoring(self, interval_minutes=30):
+        """Run rounds continuously"""
+        logger.info("Starting multi-account monitoring", extra={'interval_minutes': interval_minutes})
+
+        while True:
+            try:
+                self.run_round()
+                logger.info("Sleeping", extra={'minutes': interval_minutes})
+                time.sleep(interval_minutes * 60)
+            except KeyboardInterrupt:
+                logger.info("Monitoring stopped by user")
+                self.close()
+                break
+            except Exception as e:
+                logger.exception("Error during monitoring round, retrying in 5 minutes")
+                time.sleep(5 * 60)
+
+
+def main():
+    setup_logging()
+    accounts_file = sys.argv[1] if len(sys.argv) > 1 else ACCOUNTS_FILE
+
+    if not os.path.exists(accounts_file):
+        logger.error("Accounts file not found; create a JSON list of accounts with "
+                     "'name', 'token' and 'vault' keys", extra={'file': accounts_file})
+        return
+
+    accounts = load_accounts(accounts_file)
+    runner = MultiAccountRunner(accounts)
+
+    try:
+        # Run one round for testing
+        runner.run_round()
+
+        # Uncomment the next line to start continuous monitoring
+        # runner.start_monitoring()
+    finally:
+        runner.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,525 @@
+"""
+Shared AI Employee pipeline
+One engine for every entry point; only the email source differs
+(see email_sources.py and gmail_source.py):
+1. Source email → EMAIL_xxx.md in /Needs_Action
+2. Claude process → PLAN_xxx.md banao
+3. File /Done mein move
+4. Dashboard auto-update
+"""
+
+import os
+import time
+from datetime import datetime
+from work_lease import LeaseManager, note_id_for
+from dashboard import STATUS_HEADING, status_lines, write_dashboard
+from live_dashboard import LiveDashboard
+from retention import RetentionEngine, archived_count
+from frontmatter import render_frontmatter, read_frontmatter, update_frontmatter
+from attachments import AttachmentStore, attachment_links
+from logging_setup import get_logger, correlation
+from admission import AdmissionController, classify_priority, NORMAL
+from dedup import DuplicateIndex, fingerprint
+
+# Define folder paths
+VAULT_PATH = "bronze_vault"
+
+# Overall cap on emails handled per cycle
+MAX_EMAILS_PER_CYCLE = 500
+
+# Port for the optional live dashboard (python ai_employee.py --live-dashboard)
+LIVE_DASHBOARD_PORT = 8765
+
+logger = get_logger("pipeline")
+
+class Pipeline:
+    def __init__(self, source, vault_path=VAULT_PATH):
+        self.last_checked_time = None
+        
+        # Where email comes from: Gmail, mock, synthetic or a local server
+        self.source = source
+        
+        # Each instance owns its vault subtree so several
+        # mailboxes can run side by side (see multi_account.py)
+        self.vault_path = vault_path
+        self.inbox_path = os.path.join(vault_path, "Inbox")
+        self.needs_action_path = os.path.join(vault_path, "Needs_Action")
+        self.done_path = os.path.join(vault_path, "Done")
+        self.dashboard_file = os.path.join(vault_path, "Dashboard.md")
+        
+        # Leases let several workers share one vault without racing
+        self.leases = LeaseManager(vault_path)
+        
+        # Deduplicated attachment blobs, shared by all notes in the vault
+        self.attachments = AttachmentStore(vault_path, source)
+        
+        # Rolls old Done notes into compressed monthly archives
+        self.retention = RetentionEngine(vault_path, leases=self.leases)
+        
+        # Chooses normal/degraded/overloaded processing from the backlog
+        self.admission = AdmissionController()
+        
+        # SimHash index used to fold near-duplicate mail into one note
+        self.dedup = DuplicateIndex(vault_path)
+        
+        # Optional in-memory status service (see enable_live_dashboard)
+        self.live_dashboard = None
+        
+    def setup_directories(self):
+        """Create required directories if they don't exist"""
+        os.makedirs(self.inbox_path, exist_ok=True)
+        os.makedirs(self.needs_action_path, exist_ok=True)
+        os.makedirs(self.done_path, exist_ok=True)
+        
+    def connect(self):
+        """Connect the email source (authenticates for Gmail)"""
+        return self.source.connect()
+    
+    def iter_recent_emails(self, max_total=None, skip_done=False, message_ids=None):
+        """Yield recent emails as they are fetched, stopping after max_total"""
+        yielded = 0
+        msg_ids = self.source.iter_message_ids() if message_ids is None else message_ids
+        
+        while max_total is None or yielded < max_total:
+            try:
+                msg_id = next(msg_ids, None)
+            except self.source.errors as error:
+                logger.error("Listing messages failed", extra={'error': str(error)})
+                return
+            if msg_id is None:
+                return
+            
+            # No need to spend quota on a get for mail we already handled
+            note_id = note_id_for(msg_id)
+            if skip_done and (self.is_done(note_id) or self.is_pending(note_id) or
+                              self.dedup.is_collapsed(msg_id)):
+                continue
+            
+            # Retries happen inside the limiter; a message that still fails
+            # is skipped so the rest of the batch goes through
+            try:
+                email = self.source.fetch_email(msg_id)
+            except self.source.errors as error:
+                logger.warning("Skipping message", extra={'message_id': msg_id, 'error': str(error)})
+                self.notify('error', message_id=msg_id, error=str(error))
+                continue
+            
+            yielded += 1
+            yield email
+    
+    def get_recent_emails(self, max_results=10):
+        """Get recent emails from the source"""
+        return list(self.iter_recent_emails(max_total=max_results))
+    
+    def note_meta(self, email, priority=None):
+        """Frontmatter fields for an email's notes"""
+        return {
+            'message_id': email.id,
+            'thread_id': email.thread_id,
+            'sender': email.sender,
+            'subject': email.subject,
+            'received': email.received,
+            'priority': priority or classify_priority(email),
+            'status': "needs_action",
+        }
+    
+    def create_email_note(self, email, meta=None, attachments=None):
+        """Create an EMAIL_xxx.md file in Needs_Action folder"""
+        # Named after the message ID so workers never collide
+        filename = f"EMAIL_{note_id_for(email.id)}.md"
+        filepath = os.path.join(self.needs_action_path, filename)
+        
+        if meta is None:
+            meta = self.note_meta(email)
+        
+        content = render_frontmatter(meta) + f"""# Email Note: {email.subject}
+
+## Sender
+{email.sender}
+
+## Date
+{email.timestamp}
+
+## Content
+{email.body}
+{self.attachments_section(attachments)}
+## Action Required
+- [ ] Review and prioritize
+- [ ] Create action plan if needed
+- [ ] Process and move to Done
+
+## Priority
+- [ ] High
+- [ ] Medium  
+- [ ] Low
+"""
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        logger.info("Created email note", extra={'sample': True, 'file': filename})
+        self.notify('note_created', file=filename, subject=email.subject)
+        return filepath
+    
+    def attachments_section(self, attachments):
+        """Markdown section linking stored attachments, empty if there are none"""
+        if not attachments:
+            return ""
+        return "\n## Attachments\n" + "\n".join(attachment_links(attachments)) + "\n"
+    
+    def process_with_claude(self, email_note_path, meta=None, summary_only=False):
+        """Simulate processing with Claude to create PLAN_xxx.md"""
+        # In a real implementation, this would call the Claude API
+        # For now, we'll simulate the process
+        
+        # The pipeline hands over the note's metadata in memory; notes
+        # picked up from disk only need their frontmatter read
+        if meta is None:
+            meta = read_frontmatter(email_note_path)
+        
+        if 'subject' in meta:
+            subject = meta['subject']
+        else:
+            # Older notes have no frontmatter: "# Email Note: Subject"
+            with open(email_note_path, 'r', encoding='utf-8') as f:
+                subject = f.readline().replace("# Email Note: ", "").strip()
+        
+        note_id = os.path.basename(email_note_path)[len("EMAIL_"):-len(".md")]
+        filename = f"PLAN_{note_id}.md"
+        filepath = os.path.join(self.needs_action_path, filename)
+        
+        plan_meta = dict(meta, subject=subject, status="planned",
+                         note=os.path.basename(email_note_path))
+        
+        if summary_only:
+            # Cheap plan used while the system is under load
+            plan_meta['plan_mode'] = "summary"
+            plan_content = render_frontmatter(plan_meta) + f"""# Action Plan: {subject}
+
+## Summary
+Summary-only plan for the email titled "{subject}", created while the system was under load.
+
+## Tasks
+1. [ ] Review the email and expand this plan if needed
+"""
+        else:
+            # Simulated plan content
+            plan_content = render_frontmatter(plan_meta) + f"""# Action Plan: {subject}
+
+## Summary
+This plan was generated based on the email titled "{subject}".
+
+## Tasks
+1. [ ] Task 1 - Description of first action item
+2. [ ] Task 2 - Description of second action item
+3. [ ] Task 3 - Description of third action item
+
+## Timeline
+- Priority: {plan_meta.get('priority', 'medium').capitalize()}
+- Due Date: Within 24-48 hours
+
+## Resources Needed
+- Access to relevant documents
+- Team member consultation if required
+
+## Dependencies
+- Previous related tasks completion
+- Availability of required resources
+
+## Success Criteria
+- [ ] All action items completed
+- [ ] Stakeholders notified of completion
+- [ ] Follow-up scheduled if needed
+"""
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(plan_content)
+        
+        logger.info("Created action plan", extra={'sample': True, 'file': filename})
+        self.notify('plan_created', file=filename, subject=subject)
+        return filepath
+    
+    def move_to_done(self, file_path):
+        """Move processed file to Done folder"""
+        filename = os.path.basename(file_path)
+        new_path = os.path.join(self.done_path, filename)
+        
+        # Email notes say needs_action or deferred until here; retention
+        # dates the note (and its plan) by when it was completed
+        if filename.startswith("EMAIL_"):
+            update_frontmatter(file_path, {'status': "done",
+                                           'completed': datetime.now().isoformat(timespec='seconds')})
+        
+        # Move the file (os.replace also overwrites on Windows)
+        os.replace(file_path, new_path)
+        logger.info("Moved to Done", extra={'sample': True, 'file': filename})
+        self.notify('moved_to_done', file=filename)
+        return new_path
+    
+    def notify(self, event, **details):
+        """Pass a pipeline event to the live dashboard, if one is running"""
+        if self.live_dashboard:
+            self.live_dashboard.record(event, **details)
+    
+    def enable_live_dashboard(self, port=LIVE_DASHBOARD_PORT):
+        """Start the embedded live dashboard service for this vault"""
+        self.live_dashboard = LiveDashboard(self, port=port)
+        self.live_dashboard.start()
+    
+    def system_status(self):
+        """System Status line for the dashboard, including the admission mode"""
+        if self.admission.mode == NORMAL:
+            return "Active"
+        return f"Active ({self.admission.mode} mode)"
+    
+    def update_dashboard(self):
+        """Update Dashboard.md with current status"""
+        if self.live_dashboard:
+            self.live_dashboard.set_status(self.system_status())
+            # Counters are kept current in memory and the live service
+            # writes Dashboard.md on its own throttled schedule
+            return
+        
+        # Count files in each folder
+        needs_action_count = len([f for f in os.listdir(self.needs_action_path) if f.endswith('.md')])
+        done_count = len([f for f in os.listdir(self.done_path) if f.endswith('.md')])
+        
+        # Archived notes still count as completed
+        done_count += archived_count(self.vault_path)
+        
+        write_dashboard(self.dashboard_file, {
+            STATUS_HEADING: status_lines(needs_action_count, done_count, self.system_status())
+        })
+        
+        logger.info("Dashboard updated")
+    
+    def is_done(self, note_id):
+        """Check whether an email note already reached the Done folder"""
+        return os.path.exists(os.path.join(self.done_path, f"EMAIL_{note_id}.md"))
+    
+    def is_pending(self, note_id):
+        """Check whether an email note is already waiting in Needs_Action"""
+        return os.path.exists(os.path.join(self.needs_action_path, f"EMAIL_{note_id}.md"))
+    
+    def process_email(self, email):
+        """Run a single email through note, plan and Done"""
+        # Every record logged for this email carries its message ID
+        with correlation(email.id):
+            note_id = note_id_for(email.id)
+            
+            if not self.leases.claim(note_id):
+                logger.info("Claimed by another worker, skipping", extra={'sample': True})
+                self.notify('skipped', subject=email.subject, reason='claimed')
+                return False
+            
+            try:
+                # Checked after claiming so a worker that just finished is seen
+                if self.is_done(note_id) or self.dedup.is_collapsed(email.id):
+                    logger.info("Already processed", extra={'sample': True})
+                    self.notify('skipped', subject=email.subject, reason='done')
+                    return False
+                
+                # Deferred or left behind by a crash; process_pending_notes finishes it
+                if self.is_pending(note_id):
+                    logger.info("Note already pending", extra={'sample': True})
+                    self.notify('skipped', subject=email.subject, reason='pending')
+                    return False
+                
+                # Alerts that only differ in timestamps or IDs are counted on
+                # the note of the first one instead of getting their own
+                value = fingerprint(email)
+                if value is not None and self.collapse_duplicate(email, value):
+                    return True
+                
+                logger.info("Processing", extra={'sample': True, 'subject': email.subject})
+                
+                meta = self.note_meta(email)
+                
+                # Under load, lower-priority mail only gets a note for now;
+                # process_pending_notes plans it once the backlog drains
+                if self.admission.should_defer(meta['priority']):
+                    meta['status'] = "deferred"
+                    attachments = self.attachments.capture(email)
+                    if not self.renew_lease(note_id):
+                        return False
+                    self.create_email_note(email, meta, attachments)
+                    if value is not None:
+                        self.dedup.add(value, note_id, email.sender)
+                    self.notify('deferred', subject=email.subject, priority=meta['priority'])
+                    # Counted once process_pending_notes finishes it
+                    return False
+                
+                # Store attachments first so the note can link to the blobs
+                attachments = self.attachments.capture(email)
+                
+                # Large attachments can take longer than the lease TTL
+                if not self.renew_lease(note_id):
+                    return False
+                
+                # Create email note in Needs_Action folder
+                email_note_path = self.create_email_note(email, meta, attachments)
+                
+                # Process with Claude to create plan, handing over the metadata
+                # so the note does not have to be read back
+                plan_path = self.process_with_claude(email_note_path, meta,
+                                                     summary_only=self.admission.summary_only)
+                if value is not None:
+                    self.dedup.add(value, note_id, email.sender)
+                
+                # Move both files to Done folder
+                self.move_to_done(email_note_path)
+                self.move_to_done(plan_path)
+                self.notify('email_processed', subject=email.subject)
+                return True
+            finally:
+                self.leases.release(note_id)
+    
+    def renew_lease(self, note_id):
+        """Extend our lease on a note; False (and the email is left alone) if it expired"""
+        if self.leases.renew(note_id):
+            return True
+        logger.warning("Lease expired while processing, leaving the email to its new owner")
+        self.notify('skipped', reason='lease lost')
+        return False
+    
+    def collapse_duplicate(self, email, value):
+        """Count email on the note of a near-duplicate; False if there is none"""
+        original_id = self.dedup.find(value, email.sender)
+        if original_id is None or original_id == note_id_for(email.id):
+            return False
+        
+        # The original may be moving to Done or getting its own update from
+        # another worker, so it is only touched under its lease
+        if not self.leases.claim(original_id):
+            # Not marked collapsed, so the next cycle counts it
+            logger.info("Original note busy, leaving duplicate for later",
+                        extra={'sample': True, 'original': original_id})
+            self.notify('skipped', subject=email.subject, reason='original busy')
+            return True
+        
+        try:
+            filename = f"EMAIL_{original_id}.md"
+            for folder in (self.needs_action_path, self.done_path):
+                note_path = os.path.join(folder, filename)
+                if os.path.exists(note_path):
+                    break
+            else:
+                # The original was archived or removed, so treat this one as new
+                return False
+            
+            meta = read_frontmatter(note_path)
+            update_frontmatter(note_path, {
+                'duplicate_count': int(meta.get('duplicate_count', 0)) + 1,
+                'last_duplicate': email.received,
+            })
+            self.dedup.mark_collapsed(email.id)
+        finally:
+            self.leases.release(original_id)
+        
+        logger.info("Collapsed near-duplicate", extra={'sample': True, 'original': original_id})
+        self.notify('duplicate', subject=email.subject, original=original_id)
+        return True
+    
+    def backlog_depth(self):
+        """EMAIL notes in Needs_Action still waiting for work, not counting deferred ones"""
+        # Deferred mail is excluded, otherwise it would hold the system in a
+        # degraded mode that keeps deferring and never catches up
+        depth = 0
+        for filename in os.listdir(self.needs_action_path):
+            if filename.startswith("EMAIL_") and filename.endswith(".md"):
+                meta = read_frontmatter(os.path.join(self.needs_action_path, filename))
+                if meta.get('status') != "deferred":
+                    depth += 1
+        return depth
+    
+    def process_pending_notes(self):
+        """Claim and finish EMAIL notes left in Needs_Action by any worker"""
+        processed = 0
+        
+        for filename in sorted(os.listdir(self.needs_action_path)):
+            if not (filename.startswith("EMAIL_") and filename.endswith(".md")):
+                continue
+            if self.admission.out_of_time():
+                break
+            
+            note_id = filename[len("EMAIL_"):-len(".md")]
+            if not self.leases.claim(note_id):
+                continue
+            
+            try:
+                email_note_path = os.path.join(self.needs_action_path, filename)
+                if not os.path.exists(email_note_path):
+                    continue  # Finished by another worker before we claimed it
+                
+                meta = read_frontmatter(email_note_path)
+                plan_path = os.path.join(self.needs_action_path, f"PLAN_{note_id}.md")
+                if not os.path.exists(plan_path):
+                    # Deferred mail stays put until the load allows it
+                    if (meta.get('status') == "deferred" and
+                            self.admission.should_defer(meta.get('priority', "medium"))):
+                        continue
+                    plan_path = self.process_with_claude(email_note_path, meta or None,
+                                                         summary_only=self.admission.summary_only)
+                
+                self.move_to_done(email_note_path)
+                self.move_to_done(plan_path)
+                self.notify('email_processed', subject=meta.get('subject'))
+                processed += 1
+            finally:
+                self.leases.release(note_id)
+        
+        return processed
+    
+    def run_cycle(self, max_emails=MAX_EMAILS_PER_CYCLE, message_ids=None):
+        """Run one complete cycle of the AI employee workflow; returns the emails processed"""
+        logger.info("Starting AI Employee cycle", extra={'mode': self.admission.mode})
+        cycle_start = time.monotonic()
+        self.admission.start_cycle()
+        
+        # Finish anything left behind by a crashed or slower worker,
+        # including mail deferred while the system was under load
+        leftover = self.process_pending_notes()
+        if leftover:
+            logger.info("Finished pending notes", extra={'count': leftover})
+        
+        # Stream recent emails so processing starts on the first message
+        processed = 0
+        # Callers working through a mailbox in slices pass where to carry on
+        for email in self.iter_recent_emails(max_total=max_emails, skip_done=True,
+                                             message_ids=message_ids):
+            if self.process_email(email):
+                processed += 1
+            if self.admission.out_of_time():
+                # The rest is not in Done yet, so the next cycle picks it up
+                logger.warning("Cycle time budget used up", extra={'count': processed})
+                break
+        logger.info("Processed recent emails", extra={'count': processed})
+        
+        # Pick the mode for the next cycle from the backlog left behind
+        self.admission.update(self.backlog_depth(), time.monotonic() - cycle_start)
+        
+        # Keep Done small; runs at most once a day
+        self.retention.run_if_due()
+        
+        # Update dashboard
+        self.update_dashboard()
+        
+        logger.info("Cycle complete")
+        # Deferred mail counts in the cycle that finally plans it
+        return leftover + processed
+    
+    def start_monitoring(self, interval_minutes=30):
+        """Start continuous monitoring of the email source"""
+        logger.info("Starting monitoring", extra={'source': self.source.name, 'interval_minutes': interval_minutes})
+        
+        while True:
+            try:
+                self.run_cycle()
+                logger.info("Sleeping", extra={'minutes': interval_minutes})
+                time.sleep(interval_minutes * 60)
+            except KeyboardInterrupt:
+                logger.info("Monitoring stopped by user")
+                break
+            except Exception as e:
+                logger.exception("Error during monitoring cycle, retrying in 5 minutes")
+                time.sleep(5 * 60)
@@ -0,0 +1,162 @@
+"""
+Quota-aware rate limiting for Gmail API calls
+Gmail charges each method a different number of quota units, so the
+limiter is a token bucket where every call spends its method's cost.
+Throttling (429, or 403 with a rate-limit reason) and server errors
+(5xx) are retried with backoff, honouring Retry-After, and temporarily
+lower the refill rate. Transport failures (timeouts, dropped or reset
+connections, TLS errors) are retried with the same backoff.
+"""
+
+import ssl
+import json
+import time
+import random
+import socket
+import threading
+from googleapiclient.errors import HttpError
+from logging_setup import get_logger
+
+logger = get_logger("rate_limiter")
+
+# Quota units per method, from the Gmail API usage limits page
+QUOTA_COSTS = {
+    'messages.list': 5,
+    'messages.get': 5,
+    'messages.attachments.get': 5,
+    'history.list': 2,
+    'getProfile': 1,
+}
+DEFAULT_COST = 5
+
+# Per-user Gmail limit is 250 quota units per second
+DEFAULT_UNITS_PER_SECOND = 250
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Gmail answers per-user throttling with 403 and one of these reasons
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+# Failures below HTTP that are worth another attempt
+TRANSIENT_ERRORS = (socket.timeout, TimeoutError, ConnectionError, ssl.SSLError)
+
+
+def error_reason(error):
+    """First 'reason' in an HttpError's JSON body, or None"""
+    try:
+        errors = json.loads(error.content)['error'].get('errors') or [{}]
+        return errors[0].get('reason')
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def is_retryable(error):
+    """Whether an HttpError is throttling or a server error worth retrying"""
+    status = getattr(error.resp, 'status', None)
+    return status in RETRYABLE_STATUSES or (status == 403 and error_reason(error) in RATE_LIMIT_REASONS)
+
+
+class TokenBucket:
+    """Thread-safe token bucket measured in quota units"""
+
+    def __init__(self, rate=DEFAULT_UNITS_PER_SECOND, capacity=None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost):
+        """Block until cost units are available, then spend them"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                wait = (cost - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def slow_down(self, factor=0.5, floor=1.0):
+        """Cut the refill rate after the server pushed back"""
+        with self.lock:
+            self._refill()
+            self.rate = max(floor, self.rate * factor)
+
+    def speed_up(self, step=None):
+        """Recover the refill rate gradually after successful calls"""
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + (step or self.max_rate * 0.05))
+
+
+class GmailRateLimiter:
+    """Runs Gmail requests through a cost-weighted bucket with retries"""
+
+    def __init__(self, rate=DEFAULT_UNITS_PER_SECOND, max_retries=5,
+                 base_delay=1.0, max_delay=64.0):
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def execute(self, request, method, http=None):
+        """Execute a googleapiclient request, retrying throttling, 5xx and transport failures"""
+        cost = QUOTA_COSTS.get(method, DEFAULT_COST)
+        attempt = 0
+
+        while True:
+            self.bucket.acquire(cost)
+            try:
+                # A per-thread http object is needed when called from workers,
+                # since httplib2 connections are not thread-safe
+                response = request.execute(http=http) if http else request.execute()
+            except TRANSIENT_ERRORS as error:
+                if attempt >= self.max_retries:
+                    raise
+
+                # Not the server pushing back, so the rate stays as it is
+                delay = self.retry_delay(None, attempt)
+                logger.warning("Gmail call failed in transport, retrying",
+                               extra={'method': method, 'error': repr(error), 'delay': round(delay, 1)})
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except HttpError as error:
+                status = getattr(error.resp, 'status', None)
+                if not is_retryable(error) or attempt >= self.max_retries:
+                    raise
+
+                self.bucket.slow_down()
+                delay = self.retry_delay(error, attempt)
+                logger.warning("Gmail call throttled, retrying",
+                               extra={'method': method, 'status': status, 'delay': round(delay, 1)})
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.bucket.rate < self.bucket.max_rate:
+                self.bucket.speed_up()
+            return response
+
+    def retry_delay(self, error, attempt):
+        """Seconds to wait before the next attempt"""
+        retry_after = None
+        resp = getattr(error, 'resp', None)
+        headers = resp if hasattr(resp, 'get') else {}
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        if value:
+            try:
+                retry_after = float(value)
+            except ValueError:
+                retry_after = None
+
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
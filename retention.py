@@ -0,0 +1,282 @@
+"""
+Retention engine for the Done folder
+Keeps recent notes "hot" in Done and rolls older EMAIL/PLAN notes into
+compressed monthly archives under bronze_vault/Archive:
+- Archive/2026-02.zip        one deflated zip per month (per-member
+                             compression, so single notes extract fast)
+- Archive/manifest.jsonl     one line per archived note -> archive name,
+                             an audit log; lookups go to the month's zip
+- Archive/summary.json       archived counts, read by the dashboard
+                             without opening any archive
+
+Notes are dated by the 'completed' time stamped into the EMAIL note's
+frontmatter when it moved to Done (falling back to the file time for
+older notes); a PLAN note goes with its EMAIL note. Later frontmatter
+updates, such as duplicate counts, do not push the date back.
+
+A run rebuilds each month's zip in a temp file and swaps it in before
+anything is removed from Done, so a crash cannot corrupt an archive.
+
+Usage: python retention.py [hot_days]
+"""
+
+import os
+import sys
+import json
+import time
+import zipfile
+from datetime import datetime
+
+from work_lease import LeaseManager
+from frontmatter import read_frontmatter
+from logging_setup import setup_logging, get_logger
+
+ARCHIVE_DIR_NAME = "Archive"
+MANIFEST_FILE = "manifest.jsonl"
+SUMMARY_FILE = "summary.json"
+
+DEFAULT_HOT_DAYS = 90
+# Retention only needs to run about once a day
+RUN_INTERVAL_SECONDS = 24 * 60 * 60
+# Vault-wide lease, so only one worker archives at a time
+RETENTION_LEASE = "retention"
+
+logger = get_logger("retention")
+
+
+class RetentionPolicy:
+    """Archive notes whose name starts with prefix once older than hot_days"""
+
+    def __init__(self, prefix, hot_days=DEFAULT_HOT_DAYS):
+        self.prefix = prefix
+        self.hot_days = hot_days
+
+    def matches(self, filename):
+        return filename.startswith(self.prefix) and filename.endswith('.md')
+
+    def is_expired(self, completed, now):
+        return now - completed > self.hot_days * 24 * 60 * 60
+
+
+DEFAULT_POLICIES = [
+    RetentionPolicy("EMAIL_"),
+    RetentionPolicy("PLAN_"),
+]
+
+
+class RetentionEngine:
+    def __init__(self, vault_path, policies=None, leases=None):
+        self.done_path = os.path.join(vault_path, "Done")
+        self.archive_path = os.path.join(vault_path, ARCHIVE_DIR_NAME)
+        self.manifest_file = os.path.join(self.archive_path, MANIFEST_FILE)
+        self.summary_file = os.path.join(self.archive_path, SUMMARY_FILE)
+        self.policies = policies or DEFAULT_POLICIES
+        self.leases = leases or LeaseManager(vault_path)
+        self.last_run = None
+
+    def run_if_due(self):
+        """Run retention at most once per RUN_INTERVAL_SECONDS"""
+        if self.last_run and time.time() - self.last_run < RUN_INTERVAL_SECONDS:
+            return 0
+        return self.run()
+
+    def run(self):
+        """Archive every expired note in Done; returns how many were archived"""
+        self.last_run = time.time()
+        if not os.path.isdir(self.done_path):
+            return 0
+
+        if not self.leases.claim(RETENTION_LEASE):
+            logger.info("Retention already running in another worker")
+            return 0
+        try:
+            return self.archive_expired()
+        finally:
+            self.leases.release(RETENTION_LEASE)
+
+    def archive_expired(self):
+        """Move expired notes from Done into the monthly archives"""
+        # Group expired notes by the month they were completed in
+        candidates = []
+        completed = {}
+        for entry in os.scandir(self.done_path):
+            if not entry.is_file():
+                continue
+            policy = next((p for p in self.policies if p.matches(entry.name)), None)
+            if policy is None:
+                continue
+            note_id = entry.name.split('_', 1)[1][:-len('.md')]
+            try:
+                stamp = entry.stat().st_mtime
+                if entry.name.startswith("EMAIL_"):
+                    stamp = completed[note_id] = completed_time(entry.path, stamp)
+            except FileNotFoundError:
+                continue  # Removed since the scan
+            candidates.append((policy, entry.name, entry.path, note_id, stamp))
+
+        by_month = {}
+        for policy, name, path, note_id, stamp in candidates:
+            # Plans go with their email note, so both land in the same archive
+            stamp = completed.get(note_id, stamp)
+            if policy.is_expired(stamp, self.last_run):
+                month = datetime.fromtimestamp(stamp).strftime("%Y-%m")
+                by_month.setdefault(month, []).append((name, path, stamp))
+
+        if not by_month:
+            return 0
+
+        os.makedirs(self.archive_path, exist_ok=True)
+        summary = self.load_summary()
+        archived = 0
+
+        for month, notes in sorted(by_month.items()):
+            archive_name = f"{month}.zip"
+
+            # A note getting a duplicate counted on it waits for the next run
+            claimed = []
+            for name, path, stamp in notes:
+                note_id = name.split('_', 1)[1][:-len('.md')]
+                if self.leases.claim(note_id):
+                    claimed.append((note_id, name, path, stamp))
+
+            try:
+                added, existing = self.rebuild_archive(archive_name, claimed)
+
+                # Only once the new zip is safely in place
+                with open(self.manifest_file, 'a', encoding='utf-8') as manifest:
+                    for name, stamp in added:
+                        manifest.write(json.dumps({
+                            'file': name,
+                            'archive': archive_name,
+                            'completed': datetime.fromtimestamp(stamp).isoformat(timespec='seconds'),
+                        }) + "\n")
+
+                        kind = name.split('_', 1)[0]
+                        summary['total'] += 1
+                        summary['by_kind'][kind] = summary['by_kind'].get(kind, 0) + 1
+                        summary['by_month'][month] = summary['by_month'].get(month, 0) + 1
+                        archived += 1
+                self.save_summary(summary)
+
+                # A rerun after a crash finds notes already archived and only removes them
+                for note_id, name, path, stamp in claimed:
+                    if name in existing:
+                        try:
+                            os.remove(path)
+                        except FileNotFoundError:
+                            pass
+            finally:
+                for note_id, name, path, stamp in claimed:
+                    self.leases.release(note_id)
+
+        logger.info("Archived notes from Done", extra={'count': archived})
+        return archived
+
+    def rebuild_archive(self, archive_name, notes):
+        """
+        Write a month's archive with notes added into a temp zip and swap it
+        in, so a crash never leaves a half-appended zip behind.
+        Returns the (name, stamp) of notes added and every name now archived.
+        """
+        archive_file = os.path.join(self.archive_path, archive_name)
+        tmp_file = archive_file + ".tmp"
+        added = []
+
+        with open(tmp_file, 'wb') as f:
+            with zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED) as new:
+                existing = set()
+                if os.path.exists(archive_file):
+                    with zipfile.ZipFile(archive_file) as old:
+                        for info in old.infolist():
+                            new.writestr(info, old.read(info))
+                            existing.add(info.filename)
+
+                for note_id, name, path, stamp in notes:
+                    if name in existing:
+                        continue
+                    try:
+                        new.write(path, arcname=name)
+                    except FileNotFoundError:
+                        continue  # Removed since the scan
+                    added.append((name, stamp))
+                    existing.add(name)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_file, archive_file)
+        return added, existing
+
+    def load_summary(self):
+        if os.path.exists(self.summary_file):
+            with open(self.summary_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'total': 0, 'by_kind': {}, 'by_month': {}}
+
+    def save_summary(self, summary):
+        tmp_file = self.summary_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp_file, self.summary_file)
+
+    def find(self, filename, completed=None):
+        """
+        Return the archive name holding filename, or None. With the note's
+        completed time (ISO string) only that month's zip is opened;
+        without it the months are tried newest first.
+        """
+        if completed:
+            months = [completed[:len("YYYY-MM")]]
+        else:
+            months = sorted(self.load_summary()['by_month'], reverse=True)
+
+        for month in months:
+            archive_name = f"{month}.zip"
+            archive_file = os.path.join(self.archive_path, archive_name)
+            if not os.path.exists(archive_file):
+                continue
+            # Only the zip's central directory is read, not the notes
+            with zipfile.ZipFile(archive_file) as archive:
+                try:
+                    archive.getinfo(filename)
+                except KeyError:
+                    continue
+            return archive_name
+        return None
+
+    def extract(self, filename, completed=None):
+        """Return the content of an archived note, or None if not archived"""
+        archive_name = self.find(filename, completed)
+        if archive_name is None:
+            return None
+        with zipfile.ZipFile(os.path.join(self.archive_path, archive_name)) as archive:
+            return archive.read(filename).decode('utf-8')
+
+
+def completed_time(path, default):
+    """Timestamp of the 'completed' frontmatter field of a note, or default"""
+    try:
+        return datetime.fromisoformat(read_frontmatter(path)['completed']).timestamp()
+    except (KeyError, ValueError):
+        return default
+
+
+def archived_count(vault_path):
+    """Number of archived notes, read from the summary only"""
+    summary_file = os.path.join(vault_path, ARCHIVE_DIR_NAME, SUMMARY_FILE)
+    if not os.path.exists(summary_file):
+        return 0
+    with open(summary_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get('total', 0)
+
+
+def main():
+    setup_logging()
+    hot_days = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_HOT_DAYS
+    policies = [RetentionPolicy("EMAIL_", hot_days), RetentionPolicy("PLAN_", hot_days)]
+
+    engine = RetentionEngine("bronze_vault", policies)
+    archived = engine.run()
+    logger.info("Retention complete", extra={'count': archived, 'hot_days': hot_days})
+
+if __name__ == "__main__":
+    main()
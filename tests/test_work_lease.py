@@ -0,0 +1,84 @@
+"""Races around claiming and taking over leases"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+from work_lease import LeaseManager
+
+
+class LeaseRaceTest(unittest.TestCase):
+    def setUp(self):
+        self.vault = tempfile.mkdtemp()
+        self.a = LeaseManager(self.vault, ttl_seconds=60, owner='A')
+        self.b = LeaseManager(self.vault, ttl_seconds=60, owner='B')
+        self.lock_path = self.a._lock_path('x')
+
+    def tearDown(self):
+        shutil.rmtree(self.vault)
+
+    def owner(self):
+        with open(self.lock_path, encoding='utf-8') as f:
+            return json.load(f)['owner']
+
+    def write_expired(self, owner):
+        with open(self.lock_path, 'w', encoding='utf-8') as f:
+            json.dump({'owner': owner, 'expires': time.time() - 1}, f)
+
+    def test_claim_is_exclusive(self):
+        self.assertTrue(self.a.claim('x'))
+        self.assertFalse(self.b.claim('x'))
+        self.assertEqual(self.owner(), 'A')
+
+    def test_empty_lock_counts_as_held(self):
+        # A lock file that exists but has no record yet (mid-write)
+        open(self.lock_path, 'w').close()
+        self.assertFalse(self.b.claim('x'))
+        self.assertTrue(os.path.exists(self.lock_path))
+
+    def test_unreadable_lock_is_taken_over_after_ttl(self):
+        open(self.lock_path, 'w').close()
+        old = time.time() - 120
+        os.utime(self.lock_path, (old, old))
+        self.assertTrue(self.b.claim('x'))
+        self.assertEqual(self.owner(), 'B')
+
+    def test_expired_lease_is_taken_over(self):
+        self.write_expired('C')
+        self.assertTrue(self.b.claim('x'))
+        self.assertEqual(self.owner(), 'B')
+
+    def test_takeover_does_not_steal_fresh_lease(self):
+        # B reads the expired record; before B renames it, A takes the
+        # lease over and creates a fresh lock in its place
+        self.write_expired('C')
+        read = self.b._read
+
+        def read_then_lose_race(path):
+            record = read(path)
+            if path == self.lock_path and record and record['owner'] == 'C':
+                self.b._read = read
+                self.assertTrue(self.a.claim('x'))
+            return record
+
+        self.b._read = read_then_lose_race
+        self.assertFalse(self.b.claim('x'))
+        self.assertEqual(self.owner(), 'A')
+        self.assertFalse(self.b.claim('x'))
+        self.assertEqual([f for f in os.listdir(self.a.lease_dir) if 'stale' in f or f.endswith('.tmp')], [])
+
+    def test_renew_and_release(self):
+        self.assertTrue(self.a.claim('x'))
+        self.assertTrue(self.a.renew('x'))
+        self.assertFalse(self.b.renew('x'))
+        self.b.release('x')
+        self.assertTrue(os.path.exists(self.lock_path))
+        self.a.release('x')
+        self.assertFalse(os.path.exists(self.lock_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
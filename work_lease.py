@@ -0,0 +1,127 @@
+"""
+Lease-based work claiming for a shared vault
+Several workers (processes or hosts on a mounted vault) can run against
+the same Needs_Action folder. Before touching an item a worker claims a
+lease on it by atomically creating a lock file; the lease expires after
+a TTL so items held by a crashed worker are picked up again.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import socket
+
+LEASE_DIR_NAME = ".leases"
+DEFAULT_TTL_SECONDS = 300
+
+
+def note_id_for(message_id):
+    """Collision-free, filesystem-safe note ID derived from the Gmail message ID"""
+    return re.sub(r'[^A-Za-z0-9_-]', '_', str(message_id))
+
+
+class LeaseManager:
+    def __init__(self, vault_path, ttl_seconds=DEFAULT_TTL_SECONDS, owner=None):
+        self.lease_dir = os.path.join(vault_path, LEASE_DIR_NAME)
+        self.ttl_seconds = ttl_seconds
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        os.makedirs(self.lease_dir, exist_ok=True)
+
+    def _lock_path(self, item_id):
+        return os.path.join(self.lease_dir, f"{item_id}.lock")
+
+    def _read(self, lock_path):
+        """Return the lease record in a lock file, or None if unreadable"""
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, fd):
+        record = {'owner': self.owner, 'expires': time.time() + self.ttl_seconds}
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+
+    def _create(self, lock_path):
+        """Atomically create a complete lock file; False if one already exists"""
+        # The record is written to a temp file first and hard-linked into
+        # place, so other workers never see an empty or half-written lock
+        tmp_path = f"{lock_path}.{uuid.uuid4().hex[:8]}.tmp"
+        self._write(os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        try:
+            os.link(tmp_path, lock_path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def claim(self, item_id):
+        """Try to take the lease on item_id; returns True if we now hold it"""
+        lock_path = self._lock_path(item_id)
+
+        for _ in range(2):
+            # link() fails if the target exists, even across hosts on NFSv3+
+            if self._create(lock_path):
+                return True
+
+            try:
+                seen = os.stat(lock_path)
+            except FileNotFoundError:
+                continue  # Released meanwhile, try again
+            record = self._read(lock_path)
+            if record is None:
+                # Unreadable locks (e.g. written by a worker that crashed
+                # mid-write) count as held until they are older than the TTL
+                if time.time() - seen.st_mtime < self.ttl_seconds:
+                    return False
+            elif record.get('expires', 0) > time.time():
+                return record.get('owner') == self.owner
+
+            # Expired lease: only one worker wins the rename. The winner checks
+            # it moved the same stale lock it looked at, not one another worker
+            # created or renewed since, before removing it and retrying
+            stale_path = f"{lock_path}.stale.{uuid.uuid4().hex[:8]}"
+            try:
+                os.rename(lock_path, stale_path)
+            except FileNotFoundError:
+                return False
+
+            moved = os.stat(stale_path)
+            if (moved.st_ino, moved.st_dev) != (seen.st_ino, seen.st_dev) or \
+                    self._read(stale_path) != record:
+                try:
+                    os.link(stale_path, lock_path)  # Put the live lease back
+                except FileExistsError:
+                    pass
+                os.remove(stale_path)
+                return False
+
+            os.remove(stale_path)
+
+        return False
+
+    def renew(self, item_id):
+        """Extend a lease we hold; returns False if it was lost"""
+        lock_path = self._lock_path(item_id)
+        record = self._read(lock_path)
+        if not record or record.get('owner') != self.owner:
+            return False
+
+        tmp_path = f"{lock_path}.{uuid.uuid4().hex[:8]}.tmp"
+        self._write(os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        os.replace(tmp_path, lock_path)
+        return True
+
+    def release(self, item_id):
+        """Drop a lease we hold"""
+        lock_path = self._lock_path(item_id)
+        record = self._read(lock_path)
+        if record and record.get('owner') == self.owner:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass